@@ -4,17 +4,118 @@ Agent nodes for DevGenius AI Multi-Agent System.
 This module contains all the agent functions that form the nodes of the development workflow graph.
 """
 
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
 import streamlit as st
 from langchain_core.messages import HumanMessage
 from models import AgentState
-from config import get_llm
-from utils import clean_code_response, execute_python_code
+from config import Config, get_llm
+from utils import clean_code_response, execute_python_code, parse_pytest_summary
+from run_store import get_run_store
+from profiling import analyze_performance, run_profile
+
+
+def find_prior_runs(user_request: str) -> List[Tuple[float, dict]]:
+    """
+    Looks up approved runs similar to the request in the local run store.
+    
+    Args:
+        user_request (str): The user's feature request
+        
+    Returns:
+        List[Tuple[float, dict]]: (similarity, record) pairs above Config.RUN_SEED_THRESHOLD
+    """
+    if not Config.RUN_STORE_ENABLED:
+        return []
+    try:
+        return get_run_store().search(user_request, min_similarity=Config.RUN_SEED_THRESHOLD)
+    except Exception as e:
+        st.warning(f"Run store lookup failed, continuing without prior runs: {e}")
+        return []
+
+
+def _format_prior_runs(prior_runs: List[dict], field: str, label: str) -> str:
+    """
+    Formats prior runs as few-shot examples for a prompt.
+    
+    Args:
+        prior_runs (List[dict]): Prior run records
+        field (str): Record field to show for each example
+        label (str): Heading for each example's field
+        
+    Returns:
+        str: Prompt section, or an empty string when there are no prior runs
+    """
+    if not prior_runs:
+        return ""
+    examples = "\n\n".join(
+        f"Example request: \"{run['request']}\"\n{label}:\n{run[field]}"
+        for run in prior_runs
+    )
+    return f"""
+        Here are approved solutions to similar past requests. Reuse what applies, but follow the current request exactly:
+
+        {examples}
+        """
+
+
+def find_cached_run(user_request: str, profiled_only: bool = False) -> Optional[dict]:
+    """
+    Looks up an approved run for the identical (normalized) request in the local run store.
+    
+    Args:
+        user_request (str): The user's feature request
+        profiled_only (bool): Only reuse runs that also passed the performance stage
+        
+    Returns:
+        Optional[dict]: The stored run record, or None
+    """
+    if not (Config.RUN_STORE_ENABLED and Config.RUN_CACHE_ENABLED):
+        return None
+    try:
+        return get_run_store().find_exact(user_request, profiled_only=profiled_only)
+    except Exception as e:
+        st.warning(f"Run store lookup failed, continuing without the cache: {e}")
+        return None
+
+
+def run_lookup_node(state: AgentState) -> dict:
+    """
+    Checks the run store before any agent runs, whichever route the request takes.
+    
+    An approved run for the identical request is returned directly; otherwise
+    similar approved runs are attached as few-shot seeds for the later agents.
+    
+    Args:
+        state (AgentState): Current state of the workflow
+        
+    Returns:
+        dict: Updated state with the cached run or the prior runs
+    """
+    record = find_cached_run(state['task'], profiled_only=bool(state.get("profile_performance")))
+    if record:
+        st.success("Reusing the approved solution to an identical earlier request.")
+        st.markdown(f"**Cached Task:**\n```markdown\n{record['task']}\n```")
+        return {
+            "task": record['task'],
+            "code": record['final_code'],
+            "test_code": record['tests'],
+            "cache_hit": True,
+            "messages": [HumanMessage(content=record['task'], name="RunStore")]
+        }
+    
+    prior_runs = [record for _, record in find_prior_runs(state['task'])]
+    if prior_runs:
+        st.write(f"Seeding with {len(prior_runs)} similar approved run(s).")
+    return {"prior_runs": prior_runs}
 
 
 def project_manager_node(state: AgentState) -> dict:
     """
     Analyzes the user request and creates a detailed, actionable task.
     
+    Similar approved runs found by the run lookup are used as few-shot examples.
+    
     Args:
         state (AgentState): Current state of the workflow
         
@@ -23,12 +124,14 @@ def project_manager_node(state: AgentState) -> dict:
     """
     st.write("### 🤵 Project Manager")
     
+    prior_runs = state.get("prior_runs", [])
+    
     with st.spinner("Breaking down the request into a task..."):
-        llm = get_llm()
+        llm = get_llm(role="project_manager")
         prompt = f"""
         You are a project manager. Your role is to take a high-level user request and break it down into a clear, concise, and actionable task for a developer.
         The task should be specific and include acceptance criteria.
-
+        {_format_prior_runs(prior_runs, "task", "Task")}
         User Request: "{state['task']}"
 
         Create a detailed task description.
@@ -43,31 +146,182 @@ def project_manager_node(state: AgentState) -> dict:
     }
 
 
-def developer_node(state: AgentState) -> dict:
+def _developer_prompt(task: str, variant: str = "", prior_runs: List[dict] = None) -> str:
     """
-    Generates Python code based on the task description.
+    Builds the developer prompt, optionally with a style variation for speculative drafts.
     
     Args:
-        state (AgentState): Current state of the workflow
+        task (str): The task description
+        variant (str): Extra guidance appended to vary the draft
+        prior_runs (List[dict], optional): Similar approved runs to use as few-shot seeds
         
     Returns:
-        dict: Updated state with code and messages
+        str: The prompt text
     """
-    st.write("### 👨‍💻 Developer")
-    
-    with st.spinner("Writing the first draft of the code..."):
-        llm = get_llm()
-        prompt = f"""
+    return f"""
         You are a senior Python developer. Your task is to write clean, efficient, and well-documented Python code based on the following task description.
         The code should be a single Python script. Do not include any test code in your response, only the functional code.
+        {variant}
+        {_format_prior_runs(prior_runs, "final_code", "Approved code")}
 
-        Task: "{state['task']}"
+        Task: "{task}"
 
         Write the Python code.
         """
-        response = llm.invoke(prompt)
+
+
+def _generate_candidate(task: str, variant: str, temperature: float, prior_runs: List[dict] = None) -> str:
+    """
+    Generates a single speculative draft. Runs in a worker thread, so it must not touch Streamlit.
+    
+    Args:
+        task (str): The task description
+        variant (str): Prompt variation for this draft
+        temperature (float): Sampling temperature for this draft
+        prior_runs (List[dict], optional): Similar approved runs to use as few-shot seeds
+        
+    Returns:
+        str: Cleaned candidate code
+    """
+    llm = get_llm(temperature=temperature, role="developer")
+    response = llm.invoke(_developer_prompt(task, variant, prior_runs))
+    return clean_code_response(response.content)
+
+
+def _generate_shared_tests(task: str) -> str:
+    """
+    Generates a pytest suite from the task description alone, so every candidate is judged by the same tests.
+    
+    Args:
+        task (str): The task description
+        
+    Returns:
+        str: Cleaned pytest code
+    """
+    llm = get_llm(role="tester")
+    prompt = f"""
+        You are a software tester. Write unit tests using the `pytest` framework for code that implements the following task.
+        The tests will be appended to the end of the implementation module, so call its functions and classes directly and do not import them.
+        Cover the main functionality and edge cases described in the task.
+
+        Task: "{task}"
+
+        Write the pytest test code. Only provide the test code.
+        """
+    response = llm.invoke(prompt)
+    return clean_code_response(response.content)
+
+
+def _select_best_candidate(candidates: List[str], test_code: str) -> Tuple[int, List[str]]:
+    """
+    Runs every candidate against the shared test suite in parallel and picks the best one.
+    
+    Candidates are ranked by passed tests, then by fewest failures; ties go to the
+    earliest (lowest temperature) candidate.
+    
+    Args:
+        candidates (List[str]): Candidate code drafts
+        test_code (str): Shared pytest suite
+        
+    Returns:
+        Tuple[int, List[str]]: (index of the best candidate, execution result per candidate)
+    """
+    with ThreadPoolExecutor(max_workers=len(candidates)) as executor:
+        # The candidate is embedded in the test file, so no separate code file is needed
+        results = list(executor.map(
+            lambda code: execute_python_code("", f"{code}\n\n{test_code}"),
+            candidates
+        ))
+
+    def score(index: int) -> Tuple[int, int, int]:
+        passed, failed = parse_pytest_summary(results[index])
+        return passed, -failed, -index
+
+    return max(range(len(candidates)), key=score), results
+
+
+def _speculative_draft(task: str, num_candidates: int, prior_runs: List[dict] = None) -> str:
+    """
+    Generates several drafts concurrently and returns the one that performs best on a shared test suite.
+    
+    Args:
+        task (str): The task description
+        num_candidates (int): Number of drafts to generate
+        prior_runs (List[dict], optional): Similar approved runs to use as few-shot seeds
+        
+    Returns:
+        str: The selected candidate code
+    """
+    num_candidates = min(num_candidates, Config.MAX_CANDIDATES)
+    variants = Config.CANDIDATE_PROMPT_VARIANTS
+    temperatures = Config.CANDIDATE_TEMPERATURES
+
+    with st.spinner(f"Writing {num_candidates} candidate drafts in parallel..."):
+        with ThreadPoolExecutor(max_workers=num_candidates + 1) as executor:
+            tests_future = executor.submit(_generate_shared_tests, task)
+            candidate_futures = [
+                executor.submit(
+                    _generate_candidate,
+                    task,
+                    variants[i % len(variants)],
+                    temperatures[i % len(temperatures)],
+                    prior_runs
+                )
+                for i in range(num_candidates)
+            ]
+            # A failed draft (rate limit, timeout) only removes that candidate
+            candidates, errors = [], []
+            for future in candidate_futures:
+                try:
+                    candidates.append(future.result())
+                except Exception as e:
+                    errors.append(e)
+            if not candidates:
+                raise RuntimeError(f"All {num_candidates} candidate drafts failed. Last error: {errors[-1]}") from errors[-1]
+            if errors:
+                st.warning(f"{len(errors)} of {num_candidates} candidate drafts failed and were dropped: {errors[-1]}")
+            try:
+                test_code = tests_future.result()
+            except Exception as e:
+                st.warning(f"Could not generate a shared test suite, using the first candidate: {e}")
+                return candidates[0]
+
+    with st.spinner("Running all candidates against the shared test suite..."):
+        best_index, results = _select_best_candidate(candidates, test_code)
+
+    for i, result in enumerate(results):
+        passed, failed = parse_pytest_summary(result)
+        marker = " ✅ selected" if i == best_index else ""
+        st.write(f"Candidate {i + 1}: {passed} passed, {failed} failed{marker}")
+
+    return candidates[best_index]
+
+
+def developer_node(state: AgentState) -> dict:
+    """
+    Generates Python code based on the task description.
+    
+    When ``num_candidates`` is greater than one, several drafts are generated
+    speculatively and the best one on a shared test suite is kept.
+    
+    Args:
+        state (AgentState): Current state of the workflow
+        
+    Returns:
+        dict: Updated state with code and messages
+    """
+    st.write("### 👨‍💻 Developer")
+    
+    prior_runs = state.get("prior_runs", [])
+    num_candidates = state.get("num_candidates", Config.NUM_CANDIDATES)
+    if num_candidates > 1:
+        clean_code = _speculative_draft(state['task'], num_candidates, prior_runs)
+    else:
+        with st.spinner("Writing the first draft of the code..."):
+            llm = get_llm(role="developer")
+            response = llm.invoke(_developer_prompt(state['task'], prior_runs=prior_runs))
+        clean_code = clean_code_response(response.content)
         
-    clean_code = clean_code_response(response.content)
     st.code(clean_code, language="python")
     
     return {
@@ -89,7 +343,7 @@ def reviewer_node(state: AgentState) -> dict:
     st.write("### 🧐 Code Reviewer")
     
     with st.spinner("Reviewing the code..."):
-        llm = get_llm()
+        llm = get_llm(role="reviewer")
         prompt = f"""
         You are a code reviewer. Your task is to review the following Python code for bugs, adherence to best practices, code smells, and potential security vulnerabilities.
         Provide constructive feedback. If the code is good, simply say "No issues found.".
@@ -124,7 +378,7 @@ def tester_node(state: AgentState) -> dict:
     st.write("### 🧪 Tester")
     
     with st.spinner("Writing and running tests..."):
-        llm = get_llm()
+        llm = get_llm(role="tester")
         prompt = f"""
         You are a software tester. Your task is to write unit tests for the following Python code using the `pytest` framework.
         The tests should cover the main functionality and edge cases.
@@ -146,10 +400,81 @@ def tester_node(state: AgentState) -> dict:
     
     return {
         "test_results": execution_result, 
+        "test_code": clean_test_code,
         "messages": [HumanMessage(content=execution_result, name="Tester")]
     }
 
 
+def performance_node(state: AgentState) -> dict:
+    """
+    Benchmarks the code over a sweep of input sizes and checks it against the performance thresholds.
+    
+    Args:
+        state (AgentState): Current state of the workflow
+        
+    Returns:
+        dict: Updated state with performance_report, performance_ok, performance_measured and messages
+    """
+    st.write("### ⏱️ Performance Profiler")
+    
+    with st.spinner("Writing a benchmark harness..."):
+        llm = get_llm(role="performance")
+        prompt = f"""
+        You are a performance engineer. Write a small benchmark harness for the main function of the following Python code.
+        The code is importable as the module `solution`. The harness must:
+        - import the function to benchmark from `solution` and assign it to a variable named `TARGET`
+        - define `make_input(n)` returning a tuple of arguments for `TARGET` that represents a realistic input of size `n`
+        Generate inputs deterministically (e.g. seed `random`). Do not time anything or print anything.
+
+        Code:
+        ```python
+        {state['code']}
+        ```
+
+        Only provide the harness code.
+        """
+        response = llm.invoke(prompt)
+        
+    harness_code = clean_code_response(response.content)
+    st.code(harness_code, language="python")
+    
+    with st.spinner("Timing the code across input sizes..."):
+        try:
+            analysis = analyze_performance(run_profile(state['code'], harness_code))
+            measured = True
+        except Exception as e:
+            # A broken harness should not block approval, but the refactor agent still sees why
+            analysis = {"ok": True, "report": f"Profiling could not run: {e}"}
+            measured = False
+    
+    st.markdown(f"**Performance Report:**\n```\n{analysis['report']}\n```")
+    
+    return {
+        "performance_report": analysis["report"],
+        "performance_ok": analysis["ok"],
+        "performance_measured": measured,
+        "messages": [HumanMessage(content=analysis["report"], name="PerformanceProfiler")]
+    }
+
+
+def _format_performance_feedback(state: AgentState) -> str:
+    """
+    Formats the performance report for the refactor prompt.
+    
+    Args:
+        state (AgentState): Current state of the workflow
+        
+    Returns:
+        str: Prompt section, or an empty string when the performance stage did not run
+    """
+    if not state.get("performance_report"):
+        return ""
+    return f"""
+        Performance Report (keep behavior identical; improve the algorithm or memory use if it exceeds the limits):
+        "{state['performance_report']}"
+        """
+
+
 def refactor_node(state: AgentState) -> dict:
     """
     Refactors the code based on review and test feedback.
@@ -163,7 +488,7 @@ def refactor_node(state: AgentState) -> dict:
     st.write("### 🛠️ Refactor Agent")
     
     with st.spinner("Refactoring the code based on feedback..."):
-        llm = get_llm()
+        llm = get_llm(role="refactor")
         prompt = f"""
         You are a refactoring expert. Your task is to rewrite the given Python code based on the feedback from the code reviewer and the results from the tester.
         Apply the necessary changes to improve the code.
@@ -178,7 +503,7 @@ def refactor_node(state: AgentState) -> dict:
 
         Test Results:
         "{state['test_results']}"
-
+        {_format_performance_feedback(state)}
         Provide the complete, refactored Python code.
         """
         response = llm.invoke(prompt)
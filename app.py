@@ -5,8 +5,9 @@ This is the main Streamlit application that provides the user interface
 for the AI multi-agent development team.
 """
 
+import time
 import streamlit as st
-from workflow import WorkflowManager
+from config import Config, validate_config
 
 
 def setup_page_config():
@@ -50,6 +51,20 @@ def render_settings_sidebar():
             help="Maximum number of code refinement iterations"
         )
         
+        num_candidates = st.slider(
+            "Speculative Drafts",
+            min_value=1,
+            max_value=Config.MAX_CANDIDATES,
+            value=Config.NUM_CANDIDATES,
+            help="Generate several first drafts in parallel and keep the one that passes the most tests (1 disables)"
+        )
+        
+        profile_performance = st.checkbox(
+            "Performance Profiling",
+            value=Config.PROFILE_PERFORMANCE,
+            help="Benchmark the code across input sizes and require it to meet the performance thresholds"
+        )
+        
         st.markdown("---")
         st.markdown("### About")
         st.markdown("""
@@ -59,20 +74,112 @@ def render_settings_sidebar():
         - 👨‍💻 **Developer**: Writes initial code
         - 🧐 **Code Reviewer**: Reviews for bugs and best practices  
         - 🧪 **Tester**: Creates and runs unit tests
+        - ⏱️ **Performance Profiler** (optional): Benchmarks the code across input sizes
         - 🛠️ **Refactor Agent**: Improves code based on feedback
         """)
         
-    return max_iterations
+    return max_iterations, num_candidates, profile_performance
+
+
+def run_queued_workflow(user_request: str, max_iterations: int, num_candidates: int,
+                        profile_performance: bool, on_step) -> dict:
+    """Enqueue the request for a worker process and follow its progress events."""
+    from job_queue import COMPLETED, FAILED, RUNNING, get_job_queue
+    from models import TaskRequest
+    
+    queue = get_job_queue()
+    job_id = queue.enqueue(TaskRequest(
+        description=user_request,
+        max_iterations=max_iterations,
+        num_candidates=num_candidates,
+        profile_performance=profile_performance
+    ))
+    st.write(f"Queued as job `{job_id}`, waiting for a worker...")
+    
+    try:
+        seen = 0
+        attempt = 0
+        last_state = None
+        last_progress = time.monotonic()
+        while True:
+            # Read the status before the events so none published before completion are missed
+            job = queue.get_job(job_id)
+            if job is None:
+                raise RuntimeError(f"Job {job_id} is no longer in the job queue.")
+            if job["status"] == RUNNING:
+                attempt = max(attempt, job["attempts"])
+            
+            for event in queue.get_events(job_id, after=seen):
+                seen += 1
+                last_progress = time.monotonic()
+                # Events of an earlier attempt describe a run that was abandoned
+                if event.get("attempt", attempt) < attempt:
+                    continue
+                attempt = event.get("attempt", attempt)
+                on_step(event)
+            
+            if job["status"] == COMPLETED:
+                return job["result"]
+            if job["status"] == FAILED:
+                raise RuntimeError(f"Job {job_id} failed after {job['attempts']} attempt(s): {job['error']}")
+            
+            if (job["status"], job["attempts"]) != last_state:
+                if last_state and job["attempts"] > max(last_state[1], 1):
+                    st.write(f"Retrying on attempt {job['attempts']} of {Config.JOB_MAX_ATTEMPTS}...")
+                last_state = (job["status"], job["attempts"])
+                last_progress = time.monotonic()
+            elif time.monotonic() - last_progress > Config.JOB_PROGRESS_TIMEOUT:
+                raise TimeoutError(
+                    f"Job {job_id} made no progress for {Config.JOB_PROGRESS_TIMEOUT:.0f}s "
+                    f"(status: {job['status']}). Check that a worker is running: python worker.py"
+                )
+            time.sleep(Config.JOB_POLL_INTERVAL)
+    except BaseException:
+        # Stopped, timed out or failed while waiting: free the slot so no worker runs it for nobody
+        try:
+            queue.cancel(job_id, "Cancelled: the UI stopped waiting for the result")
+        except Exception as e:
+            st.warning(f"Could not cancel job {job_id}: {e}")
+        raise
 
 
-def run_development_process(user_request: str, max_iterations: int):
+def run_development_process(user_request: str, max_iterations: int, num_candidates: int = 1,
+                            profile_performance: bool = False):
     """Run the development process and display results."""
     with st.status("🚀 Launching the AI development team...", expanded=True) as status:
-        # Initialize workflow manager
-        workflow_manager = WorkflowManager(max_iterations=max_iterations)
+        label = {"text": "🚀 Launching the AI development team..."}
+        
+        def on_step(event: dict):
+            label["text"] = f"🚀 Step {event['step']}: {event['node'].replace('_', ' ').title()} finished..."
+            status.update(label=label["text"])
         
-        # Execute the workflow
-        results = workflow_manager.execute_workflow(user_request)
+        def on_wait():
+            # Any UI call lets Streamlit stop this session while it follows another run
+            status.update(label=label["text"])
+        
+        if Config().JOB_QUEUE_BACKEND:
+            # Run on a worker process (see worker.py) and stream its progress back
+            results = run_queued_workflow(
+                user_request, max_iterations, num_candidates, profile_performance, on_step
+            )
+        else:
+            # Imported on first use: the workflow pulls in LangGraph, LangChain and the agents
+            from workflow import WorkflowManager
+            
+            # Initialize workflow manager
+            workflow_manager = WorkflowManager(
+                max_iterations=max_iterations,
+                num_candidates=num_candidates,
+                profile_performance=profile_performance
+            )
+            
+            # Execute the workflow (identical in-flight requests share a single run)
+            results = workflow_manager.execute_workflow(user_request, on_step=on_step, on_wait=on_wait)
+        
+        if results.get("cache_hit"):
+            st.info("Returned the approved solution from an identical earlier request.")
+        if results.get("coalesced"):
+            st.info("An identical request was already running, so this session followed it and shares its result.")
         
         # Update status based on results
         if results["success"]:
@@ -107,6 +214,10 @@ def render_results(results: dict):
             st.metric("Max Iterations", results["max_iterations"])
         with col3:
             st.metric("Execution Steps", results["execution_steps"])
+        
+        if results.get("performance_report"):
+            st.subheader("⏱️ Performance")
+            st.code(results["performance_report"], language="text")
             
         # Provide download option
         st.download_button(
@@ -129,9 +240,8 @@ def main():
     
     # Check for proper configuration before showing the interface
     try:
-        from config import get_llm
-        # Test LLM configuration
-        get_llm()
+        # Validate credentials without building an LLM client
+        validate_config()
         config_ok = True
     except Exception as e:
         config_ok = False
@@ -141,11 +251,12 @@ def main():
         
         **For Local Development:**
         1. Create a `.env` file in the project root
-        2. Add your Azure OpenAI credentials:
+        2. Add your Azure OpenAI credentials, a Groq API key, or both:
            ```
            AZURE_OPENAI_CHAT_DEPLOYMENT_NAME=your_deployment_name
            AZURE_OPENAI_CHAT_ENDPOINT=https://your-resource.openai.azure.com/
            AZURE_OPENAI_CHAT_API_KEY=your_api_key
+           GROQ_API_KEY=your_groq_api_key
            ```
         
         **For Streamlit Cloud:**
@@ -156,6 +267,7 @@ def main():
            AZURE_OPENAI_CHAT_DEPLOYMENT_NAME = "your_deployment_name"
            AZURE_OPENAI_CHAT_ENDPOINT = "https://your-resource.openai.azure.com/"
            AZURE_OPENAI_CHAT_API_KEY = "your_api_key"
+           GROQ_API_KEY = "your_groq_api_key"
            ```
         4. Save and restart the app
         """)
@@ -165,7 +277,7 @@ def main():
         return
     
     # Render settings sidebar
-    max_iterations = render_settings_sidebar()
+    max_iterations, num_candidates, profile_performance = render_settings_sidebar()
     
     # Render input form
     user_request = render_input_form()
@@ -177,7 +289,9 @@ def main():
         else:
             try:
                 # Run the development process
-                results = run_development_process(user_request, max_iterations)
+                results = run_development_process(
+                    user_request, max_iterations, num_candidates, profile_performance
+                )
                 
                 # Render results
                 render_results(results)
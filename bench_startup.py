@@ -0,0 +1,202 @@
+"""
+Cold start benchmark for DevGenius AI Multi-Agent System.
+
+Measures how long a fresh interpreter takes to import the application module and
+run the start-up credential check, reports the ``-X importtime`` breakdown, and
+fails when the median exceeds the time budget or when heavy dependencies that
+should load on first use are imported eagerly.
+
+Usage:
+    python bench_startup.py [--runs 7] [--budget 1.5] [--top 15] [--output bench_output.txt]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import List, Tuple
+
+
+# Median cold start (seconds) above which the benchmark fails
+STARTUP_BUDGET_SECONDS = 1.5
+
+# Modules that must not be imported until the first workflow run
+LAZY_MODULES = [
+    # Third-party libraries
+    "langgraph",
+    "langchain_core",
+    "langchain_openai",
+    "openai",
+    "langchain_groq",
+    "groq",
+    "pydantic",
+    "numpy",
+    # Application modules that pull the libraries above in
+    "workflow",
+    "agents",
+    "models",
+    "utils",
+    "llm_router",
+    "run_store",
+    "job_queue",
+]
+
+# Start-up work done on every page load: import the app and validate credentials
+STARTUP_SNIPPET = """
+import app
+from config import validate_config
+try:
+    validate_config()
+except ValueError:
+    pass
+"""
+
+EAGER_CHECK_SNIPPET = STARTUP_SNIPPET + """
+import sys
+print(",".join(name for name in {lazy!r} if name in sys.modules))
+"""
+
+
+def _run_python(args: List[str]) -> subprocess.CompletedProcess:
+    """
+    Runs a fresh Python interpreter in the project directory.
+
+    Args:
+        args (List[str]): Interpreter arguments
+
+    Returns:
+        subprocess.CompletedProcess: The finished process
+    """
+    return subprocess.run(
+        [sys.executable] + args,
+        capture_output=True,
+        text=True,
+        cwd=os.path.dirname(os.path.abspath(__file__))
+    )
+
+
+def measure_startup(runs: int) -> List[float]:
+    """
+    Times cold starts, each in a new interpreter.
+
+    Args:
+        runs (int): Number of timed runs
+
+    Returns:
+        List[float]: Wall-clock durations in seconds
+    """
+    durations = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        process = _run_python(["-c", STARTUP_SNIPPET])
+        durations.append(time.perf_counter() - start)
+        if process.returncode != 0:
+            raise RuntimeError(f"Start-up snippet failed:\n{process.stderr}")
+    return durations
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int]]:
+    """
+    Parses ``-X importtime`` output.
+
+    Args:
+        stderr (str): Interpreter stderr produced with ``-X importtime``
+
+    Returns:
+        List[Tuple[str, int, int]]: (module, self_us, cumulative_us) per imported module
+    """
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:"):].split("|", 2)
+        entries.append((module.strip(), int(self_us), int(cumulative_us)))
+    return entries
+
+
+def importtime_breakdown() -> List[Tuple[str, int, int]]:
+    """
+    Collects the ``-X importtime`` breakdown of the start-up work.
+
+    Returns:
+        List[Tuple[str, int, int]]: (module, self_us, cumulative_us) per imported module
+    """
+    process = _run_python(["-X", "importtime", "-c", STARTUP_SNIPPET])
+    return parse_importtime(process.stderr)
+
+
+def eagerly_imported_modules() -> List[str]:
+    """
+    Lists the lazy modules that were nonetheless imported during start-up.
+
+    Returns:
+        List[str]: Offending module names
+    """
+    process = _run_python(["-c", EAGER_CHECK_SNIPPET.format(lazy=LAZY_MODULES)])
+    output = process.stdout.strip()
+    return output.split(",") if output else []
+
+
+def format_report(durations: List[float], breakdown: List[Tuple[str, int, int]],
+                  eager: List[str], budget: float, top: int) -> str:
+    """
+    Formats the benchmark report.
+
+    Args:
+        durations (List[float]): Cold start durations in seconds
+        breakdown (List[Tuple[str, int, int]]): Parsed importtime entries
+        eager (List[str]): Lazy modules that were imported eagerly
+        budget (float): Start-up time budget in seconds
+        top (int): Number of importtime entries to show
+
+    Returns:
+        str: Human readable report
+    """
+    median = statistics.median(durations)
+    lines = [
+        "DevGenius cold start benchmark",
+        f"Runs: {len(durations)}",
+        f"Median: {median:.3f}s  Min: {min(durations):.3f}s  Max: {max(durations):.3f}s",
+        f"Budget: {budget:.3f}s  ->  {'OK' if median <= budget else 'REGRESSION'}",
+        f"Eagerly imported lazy modules: {', '.join(eager) if eager else 'none'}",
+        "",
+        f"Top {top} imports by cumulative time (-X importtime):",
+        f"{'cumulative [ms]':>16} {'self [ms]':>10}  module",
+    ]
+
+    ranked = sorted(breakdown, key=lambda entry: entry[2], reverse=True)[:top]
+    for module, self_us, cumulative_us in ranked:
+        lines.append(f"{cumulative_us / 1000:>16.1f} {self_us / 1000:>10.1f}  {module}")
+
+    return "\n".join(lines)
+
+
+def main() -> int:
+    """Run the benchmark and return the process exit code."""
+    parser = argparse.ArgumentParser(description="Measure DevGenius cold start time.")
+    parser.add_argument("--runs", type=int, default=7, help="Number of timed cold starts")
+    parser.add_argument("--budget", type=float, default=STARTUP_BUDGET_SECONDS,
+                        help="Median start-up time budget in seconds")
+    parser.add_argument("--top", type=int, default=15, help="Number of importtime entries to report")
+    parser.add_argument("--output", help="Also write the report to this file")
+    args = parser.parse_args()
+
+    durations = measure_startup(args.runs)
+    breakdown = importtime_breakdown()
+    eager = eagerly_imported_modules()
+    report = format_report(durations, breakdown, eager, args.budget, args.top)
+
+    print(report)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(report + "\n")
+
+    if statistics.median(durations) > args.budget or eager:
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,9 +5,14 @@ This module handles environment variables, LLM configuration, and application se
 """
 
 import os
+from typing import TYPE_CHECKING
 import streamlit as st
 from dotenv import load_dotenv
-from langchain_openai import AzureChatOpenAI
+
+if TYPE_CHECKING:
+    # Imported lazily in get_llm() to keep application start-up fast
+    from langchain_groq import ChatGroq
+    from langchain_openai import AzureChatOpenAI
 
 # Load environment variables from .env file (for local development)
 load_dotenv()
@@ -51,29 +56,142 @@ class Config:
         return get_config_value("AZURE_OPENAI_CHAT_API_KEY")
     AZURE_API_VERSION = "2024-12-01-preview"
     
+    # Groq Configuration (optional secondary provider)
+    @property
+    def GROQ_API_KEY(self) -> str:
+        return get_config_value("GROQ_API_KEY")
+    GROQ_MODEL = "llama-3.3-70b-versatile"
+    
     # LLM Configuration
     TEMPERATURE = 0
     MAX_TOKENS = None
     TIMEOUT = None
     MAX_RETRIES = 2
     
+    # Model Routing Settings
+    # Each agent role maps to providers in order of preference; providers without
+    # credentials are skipped, and slow or failing ones are tried last.
+    AGENT_MODEL_ROUTES = {
+        "project_manager": ["groq", "azure"],
+        "developer": ["azure", "groq"],
+        "reviewer": ["groq", "azure"],
+        "tester": ["azure", "groq"],
+        "refactor": ["azure", "groq"],
+        "performance": ["azure", "groq"],
+    }
+    HEDGE_REQUESTS = False           # Send a second request if the first is slower than its p95
+    HEDGE_DEFAULT_DELAY = 15.0       # Seconds to wait before hedging until enough latency samples exist
+    HEDGE_MIN_SAMPLES = 5
+    LATENCY_WINDOW = 50              # Recent calls kept per provider for latency statistics
+    DEGRADED_LATENCY_SECONDS = 60.0  # p95 above which a provider is demoted in the route
+    
+    # Adaptive Routing Settings (skip the project manager for precise specs)
+    ADAPTIVE_ROUTING_ENABLED = True
+    PM_SKIP_THRESHOLD = 0.7                # Classifier score needed to go straight to the developer
+    REQUEST_CLASSIFIER_WEIGHTS_PATH = None # Optional JSON {"bias": ..., "weights": {...}} replacing the defaults
+    ROUTING_LOG_PATH = ".devgenius_runs/routing_log.jsonl"
+    
+    # Performance Stage Settings (opt-in profiling after the tester)
+    PROFILE_PERFORMANCE = False
+    PERFORMANCE_INPUT_SIZES = [100, 300, 1000, 3000, 10000, 30000]
+    PERFORMANCE_REPEATS = 5
+    PERFORMANCE_CALL_TIME_LIMIT = 2.0   # Stop the sweep once one call takes this long
+    PERFORMANCE_TIMEOUT = 120           # Seconds allowed for the whole profiling run
+    PERFORMANCE_TARGET_SIZE = 100_000   # Input size the fitted curve is extrapolated to
+    PERFORMANCE_MAX_SECONDS = 1.0       # Approval threshold at the target size
+    PERFORMANCE_MAX_PEAK_MB = 256
+    
+    # Job Queue Settings (runs execute on worker.py processes when a backend is set)
+    @property
+    def JOB_QUEUE_BACKEND(self) -> str:
+        return get_config_value("DEVGENIUS_JOB_QUEUE_BACKEND")
+    
+    @property
+    def REDIS_URL(self) -> str:
+        return get_config_value("DEVGENIUS_REDIS_URL") or "redis://localhost:6379/0"
+    JOB_QUEUE_PATH = ".devgenius_jobs.sqlite3"
+    JOB_VISIBILITY_TIMEOUT = 300     # Seconds before a job without heartbeats is redelivered
+    JOB_MAX_ATTEMPTS = 3
+    JOB_MAX_PENDING = 50             # Queued plus running jobs before enqueue is refused
+    JOB_POLL_INTERVAL = 1.0
+    JOB_RETENTION_SECONDS = 7 * 24 * 3600  # How long finished jobs and their events are kept
+    JOB_PURGE_INTERVAL = 3600        # Minimum seconds between SQLite retention sweeps
+    # Seconds the UI waits without any progress before giving up on a queued job
+    JOB_PROGRESS_TIMEOUT = JOB_VISIBILITY_TIMEOUT * JOB_MAX_ATTEMPTS
+    
     # Application Settings
     MAX_ITERATIONS = 3
     CODE_EXECUTION_TIMEOUT = 30
+    COALESCE_IDENTICAL_RUNS = True
+    
+    # Speculative Generation Settings (opt-in when NUM_CANDIDATES > 1)
+    NUM_CANDIDATES = 1
+    MAX_CANDIDATES = 5
+    CANDIDATE_TEMPERATURES = [0.0, 0.4, 0.7, 0.9, 1.0]
+    CANDIDATE_PROMPT_VARIANTS = [
+        "Favor the simplest correct implementation.",
+        "Favor robust input validation and explicit error handling.",
+        "Favor efficient algorithms and data structures.",
+        "Favor small, well-named helper functions.",
+        "Favor idiomatic use of the Python standard library.",
+    ]
+    
+    # Run Store Settings (local similarity index of approved runs)
+    RUN_STORE_ENABLED = True
+    RUN_STORE_DIR = ".devgenius_runs"
+    RUN_STORE_EMBEDDING_DIM = 1024
+    RUN_SEED_COUNT = 2
+    RUN_SEED_THRESHOLD = 0.5     # Minimum similarity to use a prior run as a few-shot seed
+    RUN_CACHE_ENABLED = True     # Return a prior run's code directly for an identical (normalized) request
 
 
-def get_llm() -> AzureChatOpenAI:
+def is_provider_configured(provider: str) -> bool:
     """
-    Initialize and return the Azure OpenAI LLM instance.
+    Check whether a model provider has its credentials set.
     
+    Args:
+        provider (str): Provider name used in Config.AGENT_MODEL_ROUTES ("azure" or "groq")
+        
     Returns:
-        AzureChatOpenAI: Configured LLM instance
+        bool: True if all of the provider's credentials are present
+    """
+    config = Config()
+    if provider == "azure":
+        return bool(config.AZURE_DEPLOYMENT_NAME and config.AZURE_ENDPOINT and config.AZURE_API_KEY)
+    if provider == "groq":
+        return bool(config.GROQ_API_KEY)
+    return False
+
+
+def validate_config() -> None:
+    """
+    Validate that every agent role can reach at least one configured model provider.
+    
+    This is cheap enough to run on every page load: it only reads configuration
+    values and never imports the LLM client libraries. Provider-specific checks
+    run when a client is created.
+    
+    Raises:
+        ValueError: If no provider on some agent's route has credentials
+    """
+    for role, route in Config.AGENT_MODEL_ROUTES.items():
+        if not any(is_provider_configured(provider) for provider in route):
+            raise ValueError(
+                f"No configured LLM provider for the '{role}' agent (tried: {', '.join(route)}). "
+                "Set the Azure OpenAI credentials or GROQ_API_KEY in your environment variables or Streamlit secrets."
+            )
+
+
+def _validate_azure_config(config: Config) -> None:
+    """
+    Validate the Azure OpenAI credentials.
+    
+    Args:
+        config (Config): Configuration to check
         
     Raises:
         ValueError: If required credentials are missing or invalid
     """
-    config = Config()
-    
     # Validate that all required credentials are present
     if not config.AZURE_DEPLOYMENT_NAME:
         raise ValueError("Missing AZURE_OPENAI_CHAT_DEPLOYMENT_NAME. Please check your environment variables or Streamlit secrets.")
@@ -91,17 +209,101 @@ def get_llm() -> AzureChatOpenAI:
     # Validate deployment name (should not be a URL)
     if config.AZURE_DEPLOYMENT_NAME.startswith('http'):
         raise ValueError(f"Invalid deployment name: {config.AZURE_DEPLOYMENT_NAME}. Should be just the deployment name (e.g., 'gpt-4o-2'), not a URL.")
+
+
+def create_azure_llm(temperature: float = None) -> "AzureChatOpenAI":
+    """
+    Initialize and return the Azure OpenAI LLM instance.
+    
+    Args:
+        temperature (float, optional): Sampling temperature. Defaults to Config.TEMPERATURE
+        
+    Returns:
+        AzureChatOpenAI: Configured LLM instance
+        
+    Raises:
+        ValueError: If required credentials are missing or invalid
+    """
+    config = Config()
+    _validate_azure_config(config)
+    
+    if temperature is None:
+        temperature = Config.TEMPERATURE
     
     try:
+        from langchain_openai import AzureChatOpenAI
+        
         return AzureChatOpenAI(
             azure_deployment=config.AZURE_DEPLOYMENT_NAME,
             azure_endpoint=config.AZURE_ENDPOINT,
             api_key=config.AZURE_API_KEY,
             api_version=Config.AZURE_API_VERSION,
-            temperature=Config.TEMPERATURE,
+            temperature=temperature,
             max_tokens=Config.MAX_TOKENS,
             timeout=Config.TIMEOUT,
             max_retries=Config.MAX_RETRIES,
         )
     except Exception as e:
         raise ValueError(f"Failed to initialize Azure OpenAI client. Please check your credentials. Error: {str(e)}")
+
+
+def create_groq_llm(temperature: float = None) -> "ChatGroq":
+    """
+    Initialize and return the Groq LLM instance.
+    
+    Args:
+        temperature (float, optional): Sampling temperature. Defaults to Config.TEMPERATURE
+        
+    Returns:
+        ChatGroq: Configured LLM instance
+        
+    Raises:
+        ValueError: If the API key is missing or the client cannot be created
+    """
+    config = Config()
+    
+    if not config.GROQ_API_KEY:
+        raise ValueError("Missing GROQ_API_KEY. Please check your environment variables or Streamlit secrets.")
+    
+    if temperature is None:
+        temperature = Config.TEMPERATURE
+    
+    try:
+        from langchain_groq import ChatGroq
+        
+        return ChatGroq(
+            model=Config.GROQ_MODEL,
+            api_key=config.GROQ_API_KEY,
+            temperature=temperature,
+            max_tokens=Config.MAX_TOKENS,
+            timeout=Config.TIMEOUT,
+            max_retries=Config.MAX_RETRIES,
+        )
+    except Exception as e:
+        raise ValueError(f"Failed to initialize Groq client. Please check your credentials. Error: {str(e)}")
+
+
+def get_llm(temperature: float = None, role: str = None):
+    """
+    Return the LLM for an agent role.
+    
+    With a role, the returned LLM follows Config.AGENT_MODEL_ROUTES, falling back
+    to the next provider on failure and optionally hedging slow requests. Without
+    one, the Azure OpenAI deployment is used directly.
+    
+    Args:
+        temperature (float, optional): Sampling temperature. Defaults to Config.TEMPERATURE
+        role (str, optional): Agent role, a key of Config.AGENT_MODEL_ROUTES
+        
+    Returns:
+        An LLM exposing ``invoke(prompt)``
+        
+    Raises:
+        ValueError: If no configured provider is available for the role
+    """
+    if role is None:
+        return create_azure_llm(temperature)
+    
+    from llm_router import RoutedLLM
+    
+    return RoutedLLM(role, temperature)
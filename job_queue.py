@@ -0,0 +1,582 @@
+"""
+Job queue for DevGenius AI Multi-Agent System.
+
+This module lets workflow runs execute outside the Streamlit process: the UI
+enqueues TaskRequests, standalone workers (see worker.py) reserve and run them,
+and progress events and results flow back through the queue.
+
+Two backends are provided: a SQLite one for a single machine or shared volume,
+and a Redis one for workers spread across nodes. Both support visibility
+timeouts (a reserved job reappears if its worker stops heartbeating), bounded
+retries, backpressure (enqueue fails once too many jobs are pending) and a
+retention period after which finished jobs and their events are deleted.
+"""
+
+import json
+from abc import ABC, abstractmethod
+import sqlite3
+import time
+import uuid
+from typing import List, Optional, Tuple
+from models import TaskRequest
+from config import Config
+
+
+# Job statuses
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+
+
+# Redis scripts run atomically on the server, so a worker dying between steps
+# cannot lose a job or let two enqueues both pass the capacity check.
+
+# KEYS: pending, reserved, job; ARGV: max_pending, request, job id
+REDIS_ENQUEUE = """
+local pending = redis.call('LLEN', KEYS[1]) + redis.call('ZCARD', KEYS[2])
+if pending >= tonumber(ARGV[1]) then
+    return pending
+end
+redis.call('HSET', KEYS[3], 'request', ARGV[2], 'status', 'queued', 'attempts', 0)
+redis.call('LPUSH', KEYS[1], ARGV[3])
+return -1
+"""
+
+# KEYS: pending, reserved; ARGV: now, deadline, max_attempts, job key prefix, events key prefix, retention ms
+REDIS_RESERVE = """
+for _, job_id in ipairs(redis.call('ZRANGEBYSCORE', KEYS[2], 0, ARGV[1])) do
+    redis.call('ZREM', KEYS[2], job_id)
+    local job_key = ARGV[4] .. job_id
+    if tonumber(redis.call('HGET', job_key, 'attempts') or 0) >= tonumber(ARGV[3]) then
+        redis.call('HSET', job_key, 'status', 'failed', 'error', 'Visibility timeout expired on the final attempt')
+        redis.call('PEXPIRE', job_key, ARGV[6])
+        redis.call('PEXPIRE', ARGV[5] .. job_id, ARGV[6])
+    else
+        redis.call('HSET', job_key, 'status', 'queued')
+        redis.call('RPUSH', KEYS[1], job_id)
+    end
+end
+
+local job_id = redis.call('RPOP', KEYS[1])
+if not job_id then
+    return nil
+end
+local job_key = ARGV[4] .. job_id
+redis.call('ZADD', KEYS[2], ARGV[2], job_id)
+redis.call('HSET', job_key, 'status', 'running')
+redis.call('HINCRBY', job_key, 'attempts', 1)
+return {job_id, redis.call('HGET', job_key, 'request')}
+"""
+
+# KEYS: pending, reserved, job, events; ARGV: job id, error, max_attempts, retention ms
+REDIS_FAIL = """
+if redis.call('ZREM', KEYS[2], ARGV[1]) == 0 then
+    return 0
+end
+if tonumber(redis.call('HGET', KEYS[3], 'attempts') or 0) >= tonumber(ARGV[3]) then
+    redis.call('HSET', KEYS[3], 'status', 'failed', 'error', ARGV[2])
+    redis.call('PEXPIRE', KEYS[3], ARGV[4])
+    redis.call('PEXPIRE', KEYS[4], ARGV[4])
+else
+    redis.call('HSET', KEYS[3], 'status', 'queued', 'error', ARGV[2])
+    redis.call('RPUSH', KEYS[1], ARGV[1])
+end
+return 1
+"""
+
+# KEYS: pending, reserved, job, events; ARGV: job id, error, retention ms
+REDIS_CANCEL = """
+local status = redis.call('HGET', KEYS[3], 'status')
+if status ~= 'queued' and status ~= 'running' then
+    return 0
+end
+redis.call('LREM', KEYS[1], 0, ARGV[1])
+redis.call('ZREM', KEYS[2], ARGV[1])
+redis.call('HSET', KEYS[3], 'status', 'failed', 'error', ARGV[2])
+redis.call('PEXPIRE', KEYS[3], ARGV[3])
+redis.call('PEXPIRE', KEYS[4], ARGV[3])
+return 1
+"""
+
+
+class QueueFullError(Exception):
+    """Raised when a job is enqueued while the queue is at capacity."""
+
+
+class JobQueue(ABC):
+    """
+    Interface shared by all job queue backends.
+    """
+
+    def __init__(self, max_attempts: int = None, max_pending: int = None, retention: float = None):
+        """
+        Initialize the queue settings.
+
+        Args:
+            max_attempts (int, optional): Deliveries before a job is marked failed. Defaults to Config.JOB_MAX_ATTEMPTS
+            max_pending (int, optional): Queued plus running jobs allowed. Defaults to Config.JOB_MAX_PENDING
+            retention (float, optional): Seconds finished jobs are kept. Defaults to Config.JOB_RETENTION_SECONDS
+        """
+        self.max_attempts = max_attempts or Config.JOB_MAX_ATTEMPTS
+        self.max_pending = max_pending or Config.JOB_MAX_PENDING
+        self.retention = retention or Config.JOB_RETENTION_SECONDS
+
+    @abstractmethod
+    def enqueue(self, request: TaskRequest) -> str:
+        """
+        Add a request to the queue.
+
+        Args:
+            request (TaskRequest): The request to run
+
+        Returns:
+            str: The job id
+
+        Raises:
+            QueueFullError: If max_pending jobs are already queued or running
+        """
+
+    @abstractmethod
+    def reserve(self, visibility_timeout: float = None) -> Optional[Tuple[str, TaskRequest]]:
+        """
+        Reserve the next available job, hiding it from other workers until the timeout.
+
+        Args:
+            visibility_timeout (float, optional): Seconds before the job is redelivered. Defaults to Config.JOB_VISIBILITY_TIMEOUT
+
+        Returns:
+            Optional[Tuple[str, TaskRequest]]: (job id, request), or None if no job is available
+        """
+
+    @abstractmethod
+    def heartbeat(self, job_id: str, visibility_timeout: float = None) -> None:
+        """
+        Extend a reserved job's visibility timeout while it is still being worked on.
+
+        Args:
+            job_id (str): The job id
+            visibility_timeout (float, optional): New timeout in seconds from now. Defaults to Config.JOB_VISIBILITY_TIMEOUT
+        """
+
+    @abstractmethod
+    def complete(self, job_id: str, result: dict) -> None:
+        """
+        Mark a job as completed.
+
+        Args:
+            job_id (str): The job id
+            result (dict): The WorkflowManager result
+        """
+
+    @abstractmethod
+    def fail(self, job_id: str, error: str) -> None:
+        """
+        Record a failed attempt; the job is retried until max_attempts is reached.
+
+        Args:
+            job_id (str): The job id
+            error (str): Error description
+        """
+
+    @abstractmethod
+    def cancel(self, job_id: str, error: str = "Cancelled") -> None:
+        """
+        Withdraw a queued or running job so no worker picks it up again; finished jobs are left alone.
+
+        Args:
+            job_id (str): The job id
+            error (str): Reason recorded on the failed job
+        """
+
+    @abstractmethod
+    def publish_event(self, job_id: str, event: dict) -> None:
+        """
+        Publish a progress event for a job.
+
+        Args:
+            job_id (str): The job id
+            event (dict): JSON-serializable progress event
+        """
+
+    @abstractmethod
+    def get_events(self, job_id: str, after: int = 0) -> List[dict]:
+        """
+        Read a job's progress events.
+
+        Args:
+            job_id (str): The job id
+            after (int): Number of events already consumed
+
+        Returns:
+            List[dict]: Events published since ``after``
+        """
+
+    @abstractmethod
+    def get_job(self, job_id: str) -> Optional[dict]:
+        """
+        Read a job's status.
+
+        Args:
+            job_id (str): The job id
+
+        Returns:
+            Optional[dict]: {"status", "attempts", "result", "error"}, or None if unknown
+        """
+
+
+class SQLiteJobQueue(JobQueue):
+    """
+    Job queue backed by a SQLite database file.
+    """
+
+    def __init__(self, path: str = None, **kwargs):
+        """
+        Initialize the SQLite job queue.
+
+        Args:
+            path (str, optional): Database file. Defaults to Config.JOB_QUEUE_PATH
+            **kwargs: Passed to JobQueue
+        """
+        super().__init__(**kwargs)
+        self.path = path or Config.JOB_QUEUE_PATH
+        self._last_purge = 0.0
+        conn = self._connect()
+        try:
+            # visible_at is the redelivery deadline while a job is pending and its finish time afterwards
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    request TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    visible_at REAL NOT NULL,
+                    result TEXT,
+                    error TEXT,
+                    created_at REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS jobs_ready ON jobs (status, visible_at, created_at);
+                CREATE TABLE IF NOT EXISTS events (
+                    job_id TEXT NOT NULL,
+                    seq INTEGER NOT NULL,
+                    event TEXT NOT NULL,
+                    PRIMARY KEY (job_id, seq)
+                );
+            """)
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        # Autocommit mode; multi-statement updates use explicit IMMEDIATE transactions
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def purge_finished(self) -> int:
+        """
+        Delete finished jobs, and their events, that are older than the retention period.
+
+        Returns:
+            int: Number of jobs deleted
+        """
+        cutoff = time.time() - self.retention
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(
+                "DELETE FROM events WHERE job_id IN "
+                "(SELECT id FROM jobs WHERE status IN (?, ?) AND visible_at < ?)",
+                (COMPLETED, FAILED, cutoff)
+            )
+            deleted = conn.execute(
+                "DELETE FROM jobs WHERE status IN (?, ?) AND visible_at < ?",
+                (COMPLETED, FAILED, cutoff)
+            ).rowcount
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+        self._last_purge = time.time()
+        return deleted
+
+    def enqueue(self, request: TaskRequest) -> str:
+        # Sweep on the producer side, at most once per interval, so no extra process is needed
+        if time.time() - self._last_purge >= Config.JOB_PURGE_INTERVAL:
+            self.purge_finished()
+
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            (pending,) = conn.execute(
+                "SELECT COUNT(*) FROM jobs WHERE status IN (?, ?)", (QUEUED, RUNNING)
+            ).fetchone()
+            if pending >= self.max_pending:
+                conn.execute("ROLLBACK")
+                raise QueueFullError(f"Job queue is full ({pending} pending jobs).")
+            conn.execute(
+                "INSERT INTO jobs (id, request, status, visible_at, created_at) VALUES (?, ?, ?, ?, ?)",
+                (job_id, request.model_dump_json(), QUEUED, now, now)
+            )
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+        return job_id
+
+    def reserve(self, visibility_timeout: float = None) -> Optional[Tuple[str, TaskRequest]]:
+        visibility_timeout = visibility_timeout or Config.JOB_VISIBILITY_TIMEOUT
+        conn = self._connect()
+        try:
+            while True:
+                now = time.time()
+                conn.execute("BEGIN IMMEDIATE")
+                # Running jobs whose visibility expired belong to a worker that died
+                row = conn.execute(
+                    "SELECT id, request, attempts FROM jobs WHERE status IN (?, ?) AND visible_at <= ? "
+                    "ORDER BY created_at LIMIT 1",
+                    (QUEUED, RUNNING, now)
+                ).fetchone()
+                if row is None:
+                    conn.execute("COMMIT")
+                    return None
+
+                job_id, request_json, attempts = row
+                if attempts >= self.max_attempts:
+                    conn.execute(
+                        "UPDATE jobs SET status = ?, visible_at = ?, error = COALESCE(error, ?) WHERE id = ?",
+                        (FAILED, now, "Visibility timeout expired on the final attempt", job_id)
+                    )
+                    conn.execute("COMMIT")
+                    continue
+
+                conn.execute(
+                    "UPDATE jobs SET status = ?, attempts = attempts + 1, visible_at = ? WHERE id = ?",
+                    (RUNNING, now + visibility_timeout, job_id)
+                )
+                conn.execute("COMMIT")
+                return job_id, TaskRequest.model_validate_json(request_json)
+        finally:
+            conn.close()
+
+    def heartbeat(self, job_id: str, visibility_timeout: float = None) -> None:
+        visibility_timeout = visibility_timeout or Config.JOB_VISIBILITY_TIMEOUT
+        conn = self._connect()
+        try:
+            conn.execute(
+                "UPDATE jobs SET visible_at = ? WHERE id = ? AND status = ?",
+                (time.time() + visibility_timeout, job_id, RUNNING)
+            )
+        finally:
+            conn.close()
+
+    def complete(self, job_id: str, result: dict) -> None:
+        conn = self._connect()
+        try:
+            conn.execute(
+                "UPDATE jobs SET status = ?, visible_at = ?, result = ?, error = NULL WHERE id = ?",
+                (COMPLETED, time.time(), json.dumps(result), job_id)
+            )
+        finally:
+            conn.close()
+
+    def fail(self, job_id: str, error: str) -> None:
+        conn = self._connect()
+        try:
+            conn.execute(
+                "UPDATE jobs SET status = CASE WHEN attempts >= ? THEN ? ELSE ? END, "
+                "visible_at = ?, error = ? WHERE id = ? AND status = ?",
+                (self.max_attempts, FAILED, QUEUED, time.time(), error, job_id, RUNNING)
+            )
+        finally:
+            conn.close()
+
+    def cancel(self, job_id: str, error: str = "Cancelled") -> None:
+        conn = self._connect()
+        try:
+            conn.execute(
+                "UPDATE jobs SET status = ?, visible_at = ?, error = ? WHERE id = ? AND status IN (?, ?)",
+                (FAILED, time.time(), error, job_id, QUEUED, RUNNING)
+            )
+        finally:
+            conn.close()
+
+    def publish_event(self, job_id: str, event: dict) -> None:
+        conn = self._connect()
+        try:
+            conn.execute(
+                "INSERT INTO events (job_id, seq, event) "
+                "SELECT ?, COALESCE(MAX(seq), 0) + 1, ? FROM events WHERE job_id = ?",
+                (job_id, json.dumps(event), job_id)
+            )
+        finally:
+            conn.close()
+
+    def get_events(self, job_id: str, after: int = 0) -> List[dict]:
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT event FROM events WHERE job_id = ? AND seq > ? ORDER BY seq",
+                (job_id, after)
+            ).fetchall()
+        finally:
+            conn.close()
+        return [json.loads(event) for (event,) in rows]
+
+    def get_job(self, job_id: str) -> Optional[dict]:
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT status, attempts, result, error FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        finally:
+            conn.close()
+        if row is None:
+            return None
+        status, attempts, result, error = row
+        return {
+            "status": status,
+            "attempts": attempts,
+            "result": json.loads(result) if result else None,
+            "error": error,
+        }
+
+
+class RedisJobQueue(JobQueue):
+    """
+    Job queue backed by Redis (or any Redis-compatible server), for workers on many nodes.
+
+    Pending job ids live in a list, reserved ones in a sorted set scored by their
+    visibility deadline, and each job's fields and events in their own keys.
+    Every multi-step change runs as a server-side script, so it is atomic, and
+    finished jobs' keys expire after the retention period.
+    """
+
+    def __init__(self, url: str = None, prefix: str = "devgenius", **kwargs):
+        """
+        Initialize the Redis job queue.
+
+        Args:
+            url (str, optional): Redis URL. Defaults to Config.REDIS_URL
+            prefix (str): Key prefix, to share a server between deployments
+            **kwargs: Passed to JobQueue
+
+        Raises:
+            ImportError: If the ``redis`` package is not installed
+        """
+        super().__init__(**kwargs)
+        try:
+            import redis
+        except ImportError as e:
+            raise ImportError("The Redis job queue requires the 'redis' package: pip install redis") from e
+
+        self.client = redis.Redis.from_url(url or Config().REDIS_URL, decode_responses=True)
+        self.prefix = prefix
+        self._pending_key = f"{prefix}:pending"
+        self._reserved_key = f"{prefix}:reserved"
+        self._enqueue_script = self.client.register_script(REDIS_ENQUEUE)
+        self._reserve_script = self.client.register_script(REDIS_RESERVE)
+        self._fail_script = self.client.register_script(REDIS_FAIL)
+        self._cancel_script = self.client.register_script(REDIS_CANCEL)
+
+    @property
+    def _retention_ms(self) -> int:
+        return int(self.retention * 1000)
+
+    def _job_key(self, job_id: str) -> str:
+        return f"{self.prefix}:job:{job_id}"
+
+    def _events_key(self, job_id: str) -> str:
+        return f"{self.prefix}:events:{job_id}"
+
+    def enqueue(self, request: TaskRequest) -> str:
+        job_id = uuid.uuid4().hex
+        pending = self._enqueue_script(
+            keys=[self._pending_key, self._reserved_key, self._job_key(job_id)],
+            args=[self.max_pending, request.model_dump_json(), job_id]
+        )
+        if pending >= 0:
+            raise QueueFullError(f"Job queue is full ({pending} pending jobs).")
+        return job_id
+
+    def reserve(self, visibility_timeout: float = None) -> Optional[Tuple[str, TaskRequest]]:
+        visibility_timeout = visibility_timeout or Config.JOB_VISIBILITY_TIMEOUT
+        now = time.time()
+        # Requeues expired reservations, then pops and reserves the next job in one step
+        reserved = self._reserve_script(
+            keys=[self._pending_key, self._reserved_key],
+            args=[now, now + visibility_timeout, self.max_attempts, self._job_key(""), self._events_key(""),
+                  self._retention_ms]
+        )
+        if reserved is None:
+            return None
+
+        job_id, request_json = reserved
+        return job_id, TaskRequest.model_validate_json(request_json)
+
+    def heartbeat(self, job_id: str, visibility_timeout: float = None) -> None:
+        visibility_timeout = visibility_timeout or Config.JOB_VISIBILITY_TIMEOUT
+        # XX: only extend jobs that are still reserved
+        self.client.zadd(self._reserved_key, {job_id: time.time() + visibility_timeout}, xx=True)
+
+    def complete(self, job_id: str, result: dict) -> None:
+        pipe = self.client.pipeline()
+        pipe.zrem(self._reserved_key, job_id)
+        pipe.hset(self._job_key(job_id), mapping={"status": COMPLETED, "result": json.dumps(result)})
+        pipe.hdel(self._job_key(job_id), "error")
+        pipe.pexpire(self._job_key(job_id), self._retention_ms)
+        pipe.pexpire(self._events_key(job_id), self._retention_ms)
+        pipe.execute()
+
+    def fail(self, job_id: str, error: str) -> None:
+        self._fail_script(
+            keys=[self._pending_key, self._reserved_key, self._job_key(job_id), self._events_key(job_id)],
+            args=[job_id, error, self.max_attempts, self._retention_ms]
+        )
+
+    def cancel(self, job_id: str, error: str = "Cancelled") -> None:
+        self._cancel_script(
+            keys=[self._pending_key, self._reserved_key, self._job_key(job_id), self._events_key(job_id)],
+            args=[job_id, error, self._retention_ms]
+        )
+
+    def publish_event(self, job_id: str, event: dict) -> None:
+        pipe = self.client.pipeline()
+        pipe.rpush(self._events_key(job_id), json.dumps(event))
+        # Renewed on every event, so even events of a job that never finishes are eventually removed
+        pipe.pexpire(self._events_key(job_id), self._retention_ms)
+        pipe.execute()
+
+    def get_events(self, job_id: str, after: int = 0) -> List[dict]:
+        return [json.loads(event) for event in self.client.lrange(self._events_key(job_id), after, -1)]
+
+    def get_job(self, job_id: str) -> Optional[dict]:
+        fields = self.client.hgetall(self._job_key(job_id))
+        if not fields:
+            return None
+        return {
+            "status": fields["status"],
+            "attempts": int(fields.get("attempts", 0)),
+            "result": json.loads(fields["result"]) if fields.get("result") else None,
+            "error": fields.get("error"),
+        }
+
+
+def get_job_queue(backend: str = None) -> JobQueue:
+    """
+    Create the job queue for the configured backend.
+
+    Args:
+        backend (str, optional): "sqlite" or "redis". Defaults to Config().JOB_QUEUE_BACKEND
+
+    Returns:
+        JobQueue: The job queue
+
+    Raises:
+        ValueError: If the backend is unknown
+    """
+    backend = (backend or Config().JOB_QUEUE_BACKEND or "").lower()
+    if backend == "sqlite":
+        return SQLiteJobQueue()
+    if backend == "redis":
+        return RedisJobQueue()
+    raise ValueError(f"Unknown job queue backend: {backend!r}. Use 'sqlite' or 'redis'.")
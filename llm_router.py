@@ -0,0 +1,194 @@
+"""
+Model routing for DevGenius AI Multi-Agent System.
+
+This module routes each agent's LLM calls to the providers listed for its role in
+Config.AGENT_MODEL_ROUTES, tracks per-provider latency, falls back to the next
+provider on failure and can hedge slow requests by racing a second provider.
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Dict, List, Optional
+from config import Config, create_azure_llm, create_groq_llm, is_provider_configured
+
+
+# Provider name -> (availability check, LLM factory taking a temperature)
+PROVIDERS: Dict[str, tuple] = {
+    "azure": (lambda: is_provider_configured("azure"), create_azure_llm),
+    "groq": (lambda: is_provider_configured("groq"), create_groq_llm),
+}
+
+
+class LatencyTracker:
+    """
+    Rolling latency and failure statistics for a single provider.
+    """
+
+    def __init__(self, window: int = None):
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=window or Config.LATENCY_WINDOW)
+        self._failures = deque(maxlen=window or Config.LATENCY_WINDOW)
+
+    def record(self, seconds: float, success: bool) -> None:
+        """
+        Record the outcome of one call.
+
+        Args:
+            seconds (float): Wall-clock duration of the call
+            success (bool): Whether the call returned a response
+        """
+        with self._lock:
+            if success:
+                self._latencies.append(seconds)
+            self._failures.append(not success)
+
+    def p95(self) -> Optional[float]:
+        """
+        Return the 95th percentile latency, or None without enough samples.
+
+        Returns:
+            Optional[float]: Latency in seconds
+        """
+        with self._lock:
+            if len(self._latencies) < Config.HEDGE_MIN_SAMPLES:
+                return None
+            ordered = sorted(self._latencies)
+        return ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))]
+
+    def is_degraded(self) -> bool:
+        """
+        Check whether the provider recently failed or became too slow.
+
+        Returns:
+            bool: True if the provider should be tried after healthy ones
+        """
+        with self._lock:
+            recent_failure = any(list(self._failures)[-3:])
+        p95 = self.p95()
+        return recent_failure or (p95 is not None and p95 > Config.DEGRADED_LATENCY_SECONDS)
+
+
+# Statistics are process-wide so every session benefits from what others observed
+_trackers: Dict[str, LatencyTracker] = {name: LatencyTracker() for name in PROVIDERS}
+
+# Hedged and losing requests keep running here after the caller has its answer
+_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="llm-hedge")
+
+
+def get_provider_stats() -> Dict[str, dict]:
+    """
+    Return the current latency statistics for every provider.
+
+    Returns:
+        Dict[str, dict]: Provider name -> {"p95": seconds or None, "degraded": bool}
+    """
+    return {
+        name: {"p95": tracker.p95(), "degraded": tracker.is_degraded()}
+        for name, tracker in _trackers.items()
+    }
+
+
+class RoutedLLM:
+    """
+    LLM facade that sends each call to the best available provider for a role.
+    """
+
+    def __init__(self, role: str, temperature: float = None):
+        """
+        Initialize the routed LLM.
+
+        Args:
+            role (str): Agent role, a key of Config.AGENT_MODEL_ROUTES
+            temperature (float, optional): Sampling temperature. Defaults to Config.TEMPERATURE
+
+        Raises:
+            ValueError: If no configured provider is available for the role
+        """
+        self.role = role
+        self.temperature = temperature
+        route = Config.AGENT_MODEL_ROUTES.get(role, ["azure"])
+        self.providers = [name for name in route if name in PROVIDERS and PROVIDERS[name][0]()]
+        if not self.providers:
+            raise ValueError(f"No configured LLM provider for the '{role}' agent. Tried: {', '.join(route)}.")
+        self._clients: Dict[str, object] = {}
+
+    def _ordered_providers(self) -> List[str]:
+        # Stable sort keeps the configured preference among equally healthy providers
+        return sorted(self.providers, key=lambda name: _trackers[name].is_degraded())
+
+    def _client(self, provider: str):
+        if provider not in self._clients:
+            self._clients[provider] = PROVIDERS[provider][1](self.temperature)
+        return self._clients[provider]
+
+    def _timed_call(self, provider: str, prompt) -> object:
+        start = time.perf_counter()
+        try:
+            response = self._client(provider).invoke(prompt)
+        except Exception:
+            _trackers[provider].record(time.perf_counter() - start, success=False)
+            raise
+        _trackers[provider].record(time.perf_counter() - start, success=True)
+        return response
+
+    def invoke(self, prompt):
+        """
+        Send a prompt, falling back through the role's providers on failure.
+
+        Args:
+            prompt: Prompt accepted by LangChain chat models
+
+        Returns:
+            The first successful response
+
+        Raises:
+            Exception: The last provider error if every provider failed
+        """
+        providers = self._ordered_providers()
+        if Config.HEDGE_REQUESTS and len(providers) > 1:
+            return self._hedged_invoke(providers, prompt)
+
+        last_error = None
+        for provider in providers:
+            try:
+                return self._timed_call(provider, prompt)
+            except Exception as e:
+                last_error = e
+        raise last_error
+
+    def _hedged_invoke(self, providers: List[str], prompt):
+        """
+        Start the preferred provider, and race the next one if it exceeds its p95.
+
+        Args:
+            providers (List[str]): Providers in order of preference
+            prompt: Prompt accepted by LangChain chat models
+
+        Returns:
+            Whichever response arrives first
+        """
+        submit: Callable[[str], Future] = lambda name: _executor.submit(self._timed_call, name, prompt)
+        primary = providers[0]
+        delay = _trackers[primary].p95() or Config.HEDGE_DEFAULT_DELAY
+
+        pending = {submit(primary)}
+        remaining = list(providers[1:])
+        done, pending = wait(pending, timeout=delay)
+
+        last_error = None
+        while True:
+            for future in done:
+                try:
+                    return future.result()
+                except Exception as e:
+                    last_error = e
+
+            # Hedge after the p95 delay, or fall back as soon as a request failed
+            if remaining and (not done or not pending):
+                pending.add(submit(remaining.pop(0)))
+            if not pending:
+                raise last_error
+
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
@@ -16,12 +16,21 @@ class AgentState(TypedDict):
     This state is passed between agents and contains all the information
     needed for the development workflow.
     """
+    run_id: str              # Unique identifier of this workflow run
     task: str                # The task description from the project manager
     code: str                # The current code being developed
     review: str              # Code review feedback
     test_results: str        # Results from test execution
     iterations: int          # Current iteration count
     max_iterations: int      # Maximum allowed iterations
+    num_candidates: int      # Number of speculative developer drafts (1 disables)
+    test_code: str           # The most recent generated test code
+    prior_runs: List[dict]   # Similar approved runs used as few-shot seeds
+    cache_hit: bool          # Whether a prior run's code was reused directly
+    profile_performance: bool  # Whether the performance stage runs after the tester
+    performance_report: str  # Profiling summary from the performance stage
+    performance_ok: bool     # Whether the code met the performance thresholds
+    performance_measured: bool  # Whether the last performance stage actually timed the code
     final_code: str          # The final approved code
     messages: Annotated[List[BaseMessage], lambda x, y: x + y]  # Message history
 
@@ -32,6 +41,8 @@ class TaskRequest(BaseModel):
     """
     description: str = Field(..., description="The task description provided by the user")
     max_iterations: int = Field(default=3, description="Maximum number of refinement iterations")
+    num_candidates: int = Field(default=1, description="Number of speculative first drafts to generate and test in parallel")
+    profile_performance: bool = Field(default=False, description="Whether to benchmark the code and require it to meet performance thresholds")
 
 
 class CodeExecutionResult(BaseModel):
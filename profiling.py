@@ -0,0 +1,208 @@
+"""
+Performance profiling for DevGenius AI Multi-Agent System.
+
+This module times generated code in a sandbox over a sweep of input sizes, fits an
+empirical complexity curve to the measurements and checks the extrapolated running
+time and peak memory against the configured thresholds.
+"""
+
+import json
+import math
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from typing import Callable, Dict, List, Optional, Tuple
+from config import Config
+
+
+# Runs inside the sandbox next to solution.py (the code) and harness.py (the input generator)
+PROFILE_RUNNER = '''
+import json
+import sys
+import time
+import tracemalloc
+from harness import TARGET, make_input
+
+sizes = json.loads(sys.argv[1])
+repeats = int(sys.argv[2])
+call_time_limit = float(sys.argv[3])
+
+
+def as_args(value):
+    return value if isinstance(value, tuple) else (value,)
+
+
+measurements = []
+for n in sizes:
+    timings = []
+    for _ in range(repeats):
+        # Fresh input each repeat, so in-place algorithms are not timed on already processed data
+        args = as_args(make_input(n))
+        start = time.perf_counter()
+        TARGET(*args)
+        timings.append(time.perf_counter() - start)
+        if timings[-1] > call_time_limit:
+            break
+
+    # Tracing slows calls down several times, so skip it once calls are already too slow
+    peak = 0
+    if min(timings) <= call_time_limit:
+        args = as_args(make_input(n))
+        tracemalloc.start()
+        TARGET(*args)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    measurements.append({"n": n, "seconds": min(timings), "peak_bytes": peak})
+    if min(timings) > call_time_limit:
+        break
+
+print(json.dumps(measurements))
+'''
+
+# Candidate growth functions, from slowest to fastest growing
+COMPLEXITY_MODELS: List[Tuple[str, Callable[[float], float]]] = [
+    ("O(1)", lambda n: 1.0),
+    ("O(log n)", lambda n: math.log2(n)),
+    ("O(n)", lambda n: n),
+    ("O(n log n)", lambda n: n * math.log2(n)),
+    ("O(n²)", lambda n: n ** 2),
+    ("O(n³)", lambda n: n ** 3),
+]
+
+
+def run_profile(code: str, harness_code: str, sizes: List[int] = None, repeats: int = None) -> List[dict]:
+    """
+    Times the target function of a harness over a sweep of input sizes in a sandbox.
+
+    Args:
+        code (str): The code under test, importable as ``solution``
+        harness_code (str): Defines ``TARGET`` and ``make_input(n)``
+        sizes (List[int], optional): Input sizes. Defaults to Config.PERFORMANCE_INPUT_SIZES
+        repeats (int, optional): Timed calls per size. Defaults to Config.PERFORMANCE_REPEATS
+
+    Returns:
+        List[dict]: One {"n", "seconds", "peak_bytes"} entry per measured size
+
+    Raises:
+        RuntimeError: If the harness fails or times out
+    """
+    sizes = sizes or Config.PERFORMANCE_INPUT_SIZES
+    repeats = repeats or Config.PERFORMANCE_REPEATS
+    sandbox = tempfile.mkdtemp()
+
+    try:
+        for name, content in (("solution.py", code), ("harness.py", harness_code), ("runner.py", PROFILE_RUNNER)):
+            with open(os.path.join(sandbox, name), "w") as f:
+                f.write(content)
+
+        try:
+            process = subprocess.run(
+                [sys.executable, "runner.py", json.dumps(sizes), str(repeats), str(Config.PERFORMANCE_CALL_TIME_LIMIT)],
+                capture_output=True,
+                text=True,
+                cwd=sandbox,
+                timeout=Config.PERFORMANCE_TIMEOUT
+            )
+        except subprocess.TimeoutExpired:
+            raise RuntimeError(f"Profiling timed out after {Config.PERFORMANCE_TIMEOUT}s.")
+
+        if process.returncode != 0:
+            raise RuntimeError(f"Profiling harness failed:\n{process.stderr[-2000:]}")
+
+        return json.loads(process.stdout.strip().splitlines()[-1])
+    finally:
+        shutil.rmtree(sandbox, ignore_errors=True)
+
+
+def fit_complexity(measurements: List[dict]) -> Optional[Tuple[str, float]]:
+    """
+    Fits ``seconds ≈ c · f(n)`` for each candidate complexity and picks the best.
+
+    The error is measured relative to each timing, so small and large inputs weigh
+    equally; on ties the slower-growing model wins.
+
+    Args:
+        measurements (List[dict]): Output of run_profile
+
+    Returns:
+        Optional[Tuple[str, float]]: (complexity label, fitted constant c), or None with fewer than three sizes
+    """
+    points = [(m["n"], m["seconds"]) for m in measurements if m["n"] > 1 and m["seconds"] > 0]
+    if len(points) < 3:
+        return None
+
+    best = None
+    for label, growth in COMPLEXITY_MODELS:
+        # Least squares on relative error: minimize sum((c·f/t - 1)²)
+        ratios = [growth(n) / t for n, t in points]
+        c = sum(ratios) / sum(r * r for r in ratios)
+        error = sum((c * r - 1) ** 2 for r in ratios)
+        if best is None or error < best[2] - 1e-9:
+            best = (label, c, error)
+
+    return best[0], best[1]
+
+
+def predict_seconds(label: str, constant: float, n: int) -> float:
+    """
+    Extrapolates the running time of a fitted complexity model.
+
+    Args:
+        label (str): Complexity label from fit_complexity
+        constant (float): Fitted constant from fit_complexity
+        n (int): Input size
+
+    Returns:
+        float: Predicted seconds
+    """
+    growth = dict(COMPLEXITY_MODELS)[label]
+    return constant * growth(n)
+
+
+def _format_seconds(seconds: float) -> str:
+    return f"{seconds:.3g}s" if seconds >= 1 else f"{seconds * 1000:.3g}ms"
+
+
+def analyze_performance(measurements: List[dict]) -> Dict[str, object]:
+    """
+    Summarizes profiling measurements and checks them against the thresholds.
+
+    Args:
+        measurements (List[dict]): Output of run_profile
+
+    Returns:
+        Dict[str, object]: {"ok": bool, "report": str}
+    """
+    target = Config.PERFORMANCE_TARGET_SIZE
+    peak_mb = max(m["peak_bytes"] for m in measurements) / 2 ** 20
+    peak_n = max(measurements, key=lambda m: m["peak_bytes"])["n"]
+    fit = fit_complexity(measurements)
+
+    problems = []
+    lines = []
+    if fit is None:
+        lines.append("Empirical complexity: not enough input sizes completed to fit a curve.")
+        if measurements[-1]["seconds"] > Config.PERFORMANCE_CALL_TIME_LIMIT:
+            problems.append(f"a single call at n={measurements[-1]['n']:,} already takes {measurements[-1]['seconds']:.2f}s")
+    else:
+        label, constant = fit
+        predicted = predict_seconds(label, constant, target)
+        lines.append(f"Empirical complexity: {label}; predicted {predicted:.3g}s at n={target:,} (limit {Config.PERFORMANCE_MAX_SECONDS}s).")
+        if predicted > Config.PERFORMANCE_MAX_SECONDS:
+            problems.append(f"{label} at n={target:,} takes about {predicted:.3g}s")
+
+    lines.append(f"Peak memory: {peak_mb:.1f} MB at n={peak_n:,} (limit {Config.PERFORMANCE_MAX_PEAK_MB} MB).")
+    if peak_mb > Config.PERFORMANCE_MAX_PEAK_MB:
+        problems.append(f"peak memory of {peak_mb:.1f} MB exceeds {Config.PERFORMANCE_MAX_PEAK_MB} MB")
+
+    lines.append("Measurements: " + ", ".join(f"n={m['n']:,}: {_format_seconds(m['seconds'])}" for m in measurements))
+
+    if problems:
+        lines.insert(0, "Performance issues: " + "; ".join(problems) + ".")
+    else:
+        lines.insert(0, "Performance within thresholds.")
+
+    return {"ok": not problems, "report": "\n".join(lines)}
@@ -0,0 +1,184 @@
+"""
+Request classifier for DevGenius AI Multi-Agent System.
+
+This module decides, locally and without an LLM call, whether a user request is
+already a precise specification that can go straight to the developer, skipping
+the project manager. It scores a handful of text features with a tiny logistic
+model (hand-tuned defaults, or weights loaded from a JSON file) and logs every
+decision and run outcome so the savings and the effect on approval rates can be
+measured with ``python request_classifier.py``.
+"""
+
+import json
+import math
+import os
+import re
+import threading
+import time
+from typing import Dict
+from config import Config
+
+
+# Default logistic weights; override with Config.REQUEST_CLASSIFIER_WEIGHTS_PATH
+DEFAULT_WEIGHTS = {
+    "bias": -3.0,
+    "weights": {
+        "signature": 2.5,
+        "acceptance_criteria": 1.5,
+        "examples": 1.0,
+        "structure": 0.75,
+        "types": 0.5,
+        "length": 1.0,
+        "vague": -2.0,
+    },
+}
+
+_SIGNATURE = re.compile(r"\bdef\s+\w+\s*\(|\bclass\s+\w+|\w+\([^()]*\)\s*->")
+_CRITERIA = re.compile(r"acceptance criteria|\bshould (?:return|raise)|\bmust\b|\breturns?\b|\braises?\b", re.IGNORECASE)
+_EXAMPLES = re.compile(r">>>|\bexamples?\b|\be\.g\.|==|\s->\s")
+_BULLETS = re.compile(r"^\s*(?:[-*•]|\d+[.)])\s+", re.MULTILINE)
+_TYPES = re.compile(r"\b(?:int|float|str|bool|list|dict|tuple|set|None|Optional|List|Dict)\b")
+
+_log_lock = threading.Lock()
+_weights_cache: Dict[str, dict] = {}
+
+
+def extract_features(user_request: str) -> Dict[str, float]:
+    """
+    Computes the classifier features of a request, each in [0, 1].
+
+    Args:
+        user_request (str): The user's feature request
+
+    Returns:
+        Dict[str, float]: Feature name -> value
+    """
+    words = len(user_request.split())
+    return {
+        "signature": 1.0 if _SIGNATURE.search(user_request) else 0.0,
+        "acceptance_criteria": min(len(_CRITERIA.findall(user_request)) / 3, 1.0),
+        "examples": 1.0 if _EXAMPLES.search(user_request) else 0.0,
+        "structure": min(len(_BULLETS.findall(user_request)) / 3, 1.0),
+        "types": min(len(_TYPES.findall(user_request)) / 3, 1.0),
+        "length": min(words / 80, 1.0),
+        "vague": 1.0 if words < 12 else 0.0,
+    }
+
+
+def _load_weights() -> dict:
+    """Return the classifier weights, loading the optional model file once."""
+    path = Config.REQUEST_CLASSIFIER_WEIGHTS_PATH
+    if not path:
+        return DEFAULT_WEIGHTS
+    if path not in _weights_cache:
+        with open(path, "r", encoding="utf-8") as f:
+            _weights_cache[path] = json.load(f)
+    return _weights_cache[path]
+
+
+def classify_request(user_request: str) -> Dict[str, object]:
+    """
+    Decides whether a request is specific enough to skip the project manager.
+
+    Args:
+        user_request (str): The user's feature request
+
+    Returns:
+        Dict[str, object]: {"skip_project_manager": bool, "score": float, "features": dict}
+    """
+    features = extract_features(user_request)
+    model = _load_weights()
+    z = model["bias"] + sum(model["weights"].get(name, 0.0) * value for name, value in features.items())
+    score = 1 / (1 + math.exp(-z))
+    return {
+        "skip_project_manager": score >= Config.PM_SKIP_THRESHOLD,
+        "score": score,
+        "features": features,
+    }
+
+
+def _append_log(entry: dict) -> None:
+    path = Config.ROUTING_LOG_PATH
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with _log_lock, open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(entry) + "\n")
+
+
+def log_routing_decision(run_id: str, user_request: str, decision: Dict[str, object]) -> None:
+    """
+    Records a routing decision.
+
+    Args:
+        run_id (str): Identifier of the workflow run
+        user_request (str): The user's feature request
+        decision (Dict[str, object]): Output of classify_request
+    """
+    _append_log({
+        "type": "decision",
+        "run_id": run_id,
+        "time": time.time(),
+        "request_words": len(user_request.split()),
+        **decision,
+    })
+
+
+def log_routing_outcome(run_id: str, approved: bool, iterations: int) -> None:
+    """
+    Records how a routed run ended, to compare approval rates between routes.
+
+    Args:
+        run_id (str): Identifier of the workflow run
+        approved (bool): Whether the final code was approved
+        iterations (int): Refactoring iterations used
+    """
+    _append_log({
+        "type": "outcome",
+        "run_id": run_id,
+        "time": time.time(),
+        "approved": approved,
+        "iterations": iterations,
+    })
+
+
+def summarize_routing_log(path: str = None) -> Dict[str, dict]:
+    """
+    Aggregates the routing log per route.
+
+    Args:
+        path (str, optional): Log file. Defaults to Config.ROUTING_LOG_PATH
+
+    Returns:
+        Dict[str, dict]: Route ("skipped_pm" or "full") -> {"runs", "completed", "approved", "approval_rate", "avg_iterations"}
+    """
+    decisions, outcomes = {}, {}
+    with open(path or Config.ROUTING_LOG_PATH, "r", encoding="utf-8") as f:
+        for line in f:
+            entry = json.loads(line)
+            target = decisions if entry["type"] == "decision" else outcomes
+            target[entry["run_id"]] = entry
+
+    summary = {}
+    for route, skipped in (("skipped_pm", True), ("full", False)):
+        run_ids = [run_id for run_id, d in decisions.items() if d["skip_project_manager"] == skipped]
+        finished = [outcomes[run_id] for run_id in run_ids if run_id in outcomes]
+        approved = sum(1 for outcome in finished if outcome["approved"])
+        summary[route] = {
+            "runs": len(run_ids),
+            "completed": len(finished),
+            "approved": approved,
+            "approval_rate": approved / len(finished) if finished else None,
+            "avg_iterations": sum(o["iterations"] for o in finished) / len(finished) if finished else None,
+        }
+    return summary
+
+
+if __name__ == "__main__":
+    if not os.path.exists(Config.ROUTING_LOG_PATH):
+        raise SystemExit(f"No routing log found at {Config.ROUTING_LOG_PATH}.")
+    for route, stats in summarize_routing_log().items():
+        rate = "n/a" if stats["approval_rate"] is None else f"{stats['approval_rate']:.0%}"
+        iterations = "n/a" if stats["avg_iterations"] is None else f"{stats['avg_iterations']:.2f}"
+        print(f"{route:>10}: {stats['runs']} runs, {stats['completed']} completed, "
+              f"approval rate {rate}, avg iterations {iterations}")
@@ -0,0 +1,250 @@
+"""
+Run store for DevGenius AI Multi-Agent System.
+
+This module keeps an on-disk history of approved runs and a local similarity index
+over them, so new requests can be seeded with (or answered by) prior solutions.
+Embeddings are hashed character n-grams computed locally, so no network is needed.
+"""
+
+import json
+import os
+import threading
+import zlib
+from typing import List, Optional, Tuple
+import numpy as np
+from config import Config
+from utils import normalize_request
+
+
+RUNS_FILE = "runs.jsonl"
+EMBEDDINGS_FILE = "embeddings.npy"
+
+
+def embed_text(text: str, dim: int = None) -> np.ndarray:
+    """
+    Computes a hashed character n-gram embedding for a piece of text.
+
+    Args:
+        text (str): Text to embed
+        dim (int, optional): Embedding size. Defaults to Config.RUN_STORE_EMBEDDING_DIM
+
+    Returns:
+        np.ndarray: L2-normalized float32 vector
+    """
+    dim = dim or Config.RUN_STORE_EMBEDDING_DIM
+    vector = np.zeros(dim, dtype=np.float32)
+    normalized = f" {' '.join(text.split()).casefold()} "
+
+    features = normalized.split()
+    for n in (3, 4, 5):
+        features.extend(normalized[i:i + n] for i in range(len(normalized) - n + 1))
+
+    for feature in features:
+        digest = zlib.crc32(feature.encode("utf-8"))
+        # Use the top bit as a sign so hash collisions tend to cancel out
+        vector[digest % dim] += 1.0 if digest & 0x80000000 else -1.0
+
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+class RunStore:
+    """
+    Append-only store of completed runs with a cosine similarity index.
+
+    Records live in a JSON-lines file, which is the source of truth; the embedding
+    matrix is cached next to it and rebuilt whenever the two disagree. Other
+    processes (the UI, queue workers) may append runs, so the records are
+    reloaded whenever the file's size or modification time changes.
+    """
+
+    def __init__(self, directory: str = None):
+        """
+        Initialize the run store.
+
+        Args:
+            directory (str, optional): Storage directory. Defaults to Config.RUN_STORE_DIR
+        """
+        self.directory = directory or Config.RUN_STORE_DIR
+        self._lock = threading.Lock()
+        self._records: Optional[List[dict]] = None
+        self._matrix: Optional[np.ndarray] = None
+        self._signature: Optional[Tuple[int, int]] = None
+
+    @property
+    def _runs_path(self) -> str:
+        return os.path.join(self.directory, RUNS_FILE)
+
+    @property
+    def _embeddings_path(self) -> str:
+        return os.path.join(self.directory, EMBEDDINGS_FILE)
+
+    def _file_signature(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(self._runs_path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _load(self) -> None:
+        """Load records and embeddings from disk unless the loaded copy is current."""
+        # Taken before reading, so lines appended meanwhile trigger another reload
+        signature = self._file_signature()
+        if self._records is not None and signature == self._signature:
+            return
+
+        records = []
+        if signature is not None:
+            with open(self._runs_path, "r", encoding="utf-8") as f:
+                records = [json.loads(line) for line in f if line.strip()]
+
+        matrix = None
+        if os.path.exists(self._embeddings_path):
+            try:
+                matrix = np.load(self._embeddings_path)
+            except (OSError, ValueError):
+                matrix = None  # Rebuilt below
+
+        if matrix is None or matrix.shape != (len(records), Config.RUN_STORE_EMBEDDING_DIM):
+            matrix = self._build_matrix(records)
+            self._save_matrix(matrix)
+
+        self._records = records
+        self._matrix = matrix
+        self._signature = signature
+
+    def _build_matrix(self, records: List[dict]) -> np.ndarray:
+        if not records:
+            return np.zeros((0, Config.RUN_STORE_EMBEDDING_DIM), dtype=np.float32)
+        return np.vstack([embed_text(record["request"]) for record in records])
+
+    def _save_matrix(self, matrix: np.ndarray) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        # Write then rename, so another process never loads a half-written matrix
+        temp_path = f"{self._embeddings_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, "wb") as f:
+            np.save(f, matrix)
+        os.replace(temp_path, self._embeddings_path)
+
+    def add(self, request: str, task: str, final_code: str, tests: str, iterations: int,
+            profiled: bool = False) -> dict:
+        """
+        Record a completed run.
+
+        Args:
+            request (str): The original user request
+            task (str): The task produced by the project manager
+            final_code (str): The approved code
+            tests (str): The test code the approved code passed
+            iterations (int): Refactoring iterations it took
+            profiled (bool): Whether the code also passed the performance stage
+
+        Returns:
+            dict: The stored record
+        """
+        record = {
+            "request": request,
+            "task": task,
+            "final_code": final_code,
+            "tests": tests,
+            "iterations": iterations,
+            "profiled": profiled,
+        }
+
+        line = json.dumps(record) + "\n"
+        with self._lock:
+            self._load()
+            os.makedirs(self.directory, exist_ok=True)
+            with open(self._runs_path, "a", encoding="utf-8") as f:
+                f.write(line)
+
+            expected_size = (self._signature[1] if self._signature else 0) + len(line.encode("utf-8"))
+            signature = self._file_signature()
+            if signature[1] != expected_size:
+                # Another process appended too; reload everything on next use
+                self._records = None
+                return record
+
+            self._records.append(record)
+            self._matrix = np.vstack([self._matrix, embed_text(request)[np.newaxis, :]])
+            self._save_matrix(self._matrix)
+            self._signature = signature
+
+        return record
+
+    def search(self, text: str, k: int = None, min_similarity: float = 0.0) -> List[Tuple[float, dict]]:
+        """
+        Find the stored runs most similar to a request.
+
+        Args:
+            text (str): The request to match
+            k (int, optional): Maximum number of matches. Defaults to Config.RUN_SEED_COUNT
+            min_similarity (float): Minimum cosine similarity to include a match
+
+        Returns:
+            List[Tuple[float, dict]]: (similarity, record) pairs, most similar first
+        """
+        k = k or Config.RUN_SEED_COUNT
+
+        with self._lock:
+            self._load()
+            if not self._records:
+                return []
+            similarities = self._matrix @ embed_text(text)
+            records = self._records
+
+        top = np.argsort(-similarities)[:k]
+        return [
+            (float(similarities[i]), records[i])
+            for i in top
+            if similarities[i] >= min_similarity
+        ]
+
+    def find_exact(self, text: str, profiled_only: bool = False) -> Optional[dict]:
+        """
+        Find the most recent stored run for the same normalized request.
+
+        Similarity alone cannot tell apart requests that differ by one key word
+        (e.g. "LRU" vs "LFU"), so only exact matches are safe to reuse directly.
+
+        Args:
+            text (str): The request to match
+            profiled_only (bool): Only match runs that passed the performance stage
+
+        Returns:
+            Optional[dict]: The matching record, or None
+        """
+        key = normalize_request(text)
+        with self._lock:
+            self._load()
+            records = self._records
+
+        for record in reversed(records):
+            if profiled_only and not record.get("profiled"):
+                continue
+            if normalize_request(record["request"]) == key:
+                return record
+        return None
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._load()
+            return len(self._records)
+
+
+_run_store: Optional[RunStore] = None
+_run_store_lock = threading.Lock()
+
+
+def get_run_store() -> RunStore:
+    """
+    Return the process-wide run store, creating it on first use.
+
+    Returns:
+        RunStore: The shared run store
+    """
+    global _run_store
+    with _run_store_lock:
+        if _run_store is None:
+            _run_store = RunStore()
+        return _run_store
@@ -0,0 +1,156 @@
+"""
+Single-flight coalescing for DevGenius AI Multi-Agent System.
+
+This module lets identical concurrent calls share one execution: the first caller
+for a key becomes the leader and runs the work, later callers attach as followers,
+replay the leader's progress events and receive the same result.
+"""
+
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+Emit = Callable[[dict], None]
+
+
+class _Flight:
+    """
+    Shared state for a single in-flight execution.
+    """
+
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.events: List[dict] = []
+        self.finished = False
+        self.abandoned = False
+        self.result: Any = None
+        self.error: Optional[Exception] = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key into a single execution.
+
+    - If the leader raises an ``Exception``, every follower re-raises it.
+    - If the leader is cancelled (any other ``BaseException``, such as a Streamlit
+      stop or ``KeyboardInterrupt``), followers are not failed: one of them is
+      promoted to leader and the work is restarted.
+    - A follower that is cancelled simply detaches; the leader keeps running. While
+      waiting, followers call ``on_wait`` every ``wait_interval`` seconds so a
+      cancellation (such as a Streamlit stop, delivered on the next UI call) is
+      noticed without waiting for the leader's next event.
+    """
+
+    def __init__(self, wait_interval: float = 0.5):
+        """
+        Initialize the coalescing registry.
+
+        Args:
+            wait_interval (float): Seconds between ``on_wait`` calls while a follower waits
+        """
+        self.wait_interval = wait_interval
+        self._lock = threading.Lock()
+        self._flights: Dict[str, _Flight] = {}
+
+    def run(self, key: str, fn: Callable[[Emit], Any], on_event: Optional[Emit] = None,
+            on_wait: Optional[Callable[[], None]] = None) -> Tuple[Any, bool]:
+        """
+        Run ``fn`` once per concurrent set of callers sharing ``key``.
+
+        Args:
+            key (str): Coalescing key identifying equivalent work
+            fn (Callable): Work to run; receives an ``emit(event)`` callback for progress events
+            on_event (Callable, optional): Called with each progress event, live for the leader
+                and replayed then live for followers
+            on_wait (Callable, optional): Called periodically while following; raising from it detaches
+
+        Returns:
+            Tuple[Any, bool]: (result, shared) where shared is True if this caller was a follower
+        """
+        while True:
+            with self._lock:
+                flight = self._flights.get(key)
+                leader = flight is None
+                if leader:
+                    flight = _Flight()
+                    self._flights[key] = flight
+
+            if leader:
+                return self._lead(key, flight, fn, on_event), False
+
+            result = self._follow(flight, on_event, on_wait)
+            if not flight.abandoned:
+                return result, True
+            # The leader was cancelled: retry, possibly becoming the new leader
+
+    def in_flight(self, key: str) -> bool:
+        """
+        Check whether work for ``key`` is currently running.
+
+        Args:
+            key (str): Coalescing key
+
+        Returns:
+            bool: True if a leader is running for this key
+        """
+        with self._lock:
+            return key in self._flights
+
+    def _lead(self, key: str, flight: _Flight, fn: Callable[[Emit], Any], on_event: Optional[Emit]) -> Any:
+        def emit(event: dict) -> None:
+            with flight.condition:
+                flight.events.append(event)
+                flight.condition.notify_all()
+            if on_event:
+                on_event(event)
+
+        try:
+            result = fn(emit)
+        except Exception as e:
+            self._finish(key, flight, error=e)
+            raise
+        except BaseException:
+            self._finish(key, flight, abandoned=True)
+            raise
+
+        self._finish(key, flight, result=result)
+        return result
+
+    def _follow(self, flight: _Flight, on_event: Optional[Emit], on_wait: Optional[Callable[[], None]]) -> Any:
+        index = 0
+        while True:
+            with flight.condition:
+                # Bounded waits, so the follower gets a chance to notice it was cancelled
+                if index >= len(flight.events) and not flight.finished:
+                    flight.condition.wait(self.wait_interval)
+                pending = flight.events[index:]
+                index = len(flight.events)
+                finished = flight.finished
+
+            if not pending and not finished:
+                if on_wait:
+                    on_wait()
+                continue
+
+            if on_event:
+                for event in pending:
+                    on_event(event)
+
+            if finished:
+                if flight.error is not None:
+                    raise flight.error
+                return flight.result
+
+    def _finish(self, key: str, flight: _Flight, result: Any = None,
+                error: Optional[Exception] = None, abandoned: bool = False) -> None:
+        # Unregister first so callers arriving from now on start a fresh run
+        with self._lock:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+
+        with flight.condition:
+            flight.result = result
+            flight.error = error
+            flight.abandoned = abandoned
+            flight.finished = True
+            flight.condition.notify_all()
@@ -0,0 +1,70 @@
+"""Tests for speculative candidate ranking."""
+
+import pytest
+import agents
+
+
+@pytest.fixture
+def fake_results(monkeypatch):
+    """Make each candidate's test run return a canned result keyed by the candidate code."""
+    results = {}
+    calls = []
+
+    def execute(code, test_code):
+        calls.append((code, test_code))
+        candidate = test_code.split("\n\n", 1)[0]
+        return results[candidate]
+
+    monkeypatch.setattr(agents, "execute_python_code", execute)
+    return results, calls
+
+
+def test_candidate_with_most_passing_tests_wins(fake_results):
+    results, calls = fake_results
+    results.update({
+        "a": "Tests failed.\n1 failed, 2 passed",
+        "b": "All tests passed!\n3 passed",
+        "c": "Execution timed out.",
+    })
+    best, outputs = agents._select_best_candidate(["a", "b", "c"], "TESTS")
+    assert best == 1
+    assert outputs == [results["a"], results["b"], results["c"]]
+    # The candidate is embedded in the test file; no separate code file is passed
+    assert all(code == "" and test_code.endswith("\n\nTESTS") for code, test_code in calls)
+
+
+def test_fewer_failures_break_ties_on_passed_tests(fake_results):
+    results, _ = fake_results
+    results.update({
+        "a": "Tests failed.\n2 passed, 1 failed, 1 error",
+        "b": "Tests failed.\n2 passed, 1 failed",
+    })
+    assert agents._select_best_candidate(["a", "b"], "TESTS")[0] == 1
+
+
+def test_earliest_candidate_wins_a_full_tie(fake_results):
+    results, _ = fake_results
+    results.update({
+        "a": "Execution timed out.",
+        "b": "Tests failed.\n1 error",
+        "c": "Tests failed.\n1 passed, 1 failed",
+        "d": "Tests failed.\n1 passed, 1 failed",
+    })
+    assert agents._select_best_candidate(["a", "b", "c", "d"], "TESTS")[0] == 2
+
+
+def test_timeouts_only_pick_the_first_candidate(fake_results):
+    results, _ = fake_results
+    results.update({"a": "Execution timed out.", "b": "Execution timed out."})
+    assert agents._select_best_candidate(["a", "b"], "TESTS")[0] == 0
+
+
+def test_candidates_are_run_against_the_real_test_suite():
+    candidates = [
+        "def add(a, b):\n    return a - b\n",
+        "def add(a, b):\n    return a + b\n",
+    ]
+    tests = "def test_add():\n    assert add(2, 2) == 4\n\ndef test_add_zero():\n    assert add(3, 0) == 3\n"
+    best, outputs = agents._select_best_candidate(candidates, tests)
+    assert best == 1
+    assert outputs[1].startswith("All tests passed!")
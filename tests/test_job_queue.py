@@ -0,0 +1,233 @@
+"""Tests for the SQLite and Redis job queue backends."""
+
+import time
+import pytest
+from job_queue import COMPLETED, FAILED, QUEUED, RUNNING, JobQueue, QueueFullError, RedisJobQueue, SQLiteJobQueue
+from config import Config
+from models import TaskRequest
+
+
+@pytest.fixture
+def make_redis_queue(monkeypatch):
+    """Return a factory for an empty Redis queue on an in-memory server."""
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")  # fakeredis needs it to run the queue's Lua scripts
+    import redis
+
+    server = fakeredis.FakeServer()
+    monkeypatch.setattr(redis.Redis, "from_url", lambda url, **kwargs: fakeredis.FakeRedis(server=server, **kwargs))
+    return lambda **kwargs: RedisJobQueue(url="redis://test", **kwargs)
+
+
+@pytest.fixture(params=["sqlite", "redis"])
+def make_queue(request, tmp_path):
+    """Return a factory for an empty queue of each backend."""
+    if request.param == "sqlite":
+        return lambda **kwargs: SQLiteJobQueue(path=str(tmp_path / "jobs.sqlite3"), **kwargs)
+    return request.getfixturevalue("make_redis_queue")
+
+
+def _request(description="Add two numbers"):
+    return TaskRequest(description=description, max_iterations=2)
+
+
+def test_reserve_returns_jobs_in_order_and_completes(make_queue):
+    queue = make_queue()
+    first = queue.enqueue(_request("first"))
+    second = queue.enqueue(_request("second"))
+
+    job_id, request = queue.reserve(60)
+    assert (job_id, request.description) == (first, "first")
+    assert queue.get_job(first)["status"] == RUNNING
+    assert queue.get_job(first)["attempts"] == 1
+
+    queue.complete(first, {"success": True})
+    assert queue.get_job(first)["status"] == COMPLETED
+    assert queue.get_job(first)["result"] == {"success": True}
+
+    assert queue.reserve(60)[0] == second
+    assert queue.reserve(60) is None
+
+
+def test_expired_reservation_is_redelivered(make_queue):
+    queue = make_queue(max_attempts=3)
+    job_id = queue.enqueue(_request())
+
+    assert queue.reserve(0.05)[0] == job_id
+    # Still reserved: no other worker may take it yet
+    assert queue.reserve(60) is None
+
+    time.sleep(0.1)
+    assert queue.reserve(60)[0] == job_id
+    assert queue.get_job(job_id)["attempts"] == 2
+
+
+def test_heartbeat_keeps_a_job_reserved(make_queue):
+    queue = make_queue()
+    job_id = queue.enqueue(_request())
+    queue.reserve(0.2)
+
+    for _ in range(3):
+        time.sleep(0.1)
+        queue.heartbeat(job_id, 0.2)
+        assert queue.reserve(60) is None
+    assert queue.get_job(job_id)["attempts"] == 1
+
+
+def test_expiry_on_final_attempt_marks_the_job_failed(make_queue):
+    queue = make_queue(max_attempts=1)
+    job_id = queue.enqueue(_request())
+    queue.reserve(0.05)
+
+    time.sleep(0.1)
+    assert queue.reserve(60) is None
+    job = queue.get_job(job_id)
+    assert job["status"] == FAILED
+    assert "final attempt" in job["error"]
+
+
+def test_fail_retries_until_max_attempts(make_queue):
+    queue = make_queue(max_attempts=2)
+    job_id = queue.enqueue(_request())
+
+    queue.reserve(60)
+    queue.fail(job_id, "first error")
+    assert queue.get_job(job_id)["status"] == QUEUED
+
+    assert queue.reserve(60)[0] == job_id
+    queue.fail(job_id, "second error")
+    job = queue.get_job(job_id)
+    assert (job["status"], job["attempts"], job["error"]) == (FAILED, 2, "second error")
+    assert queue.reserve(60) is None
+
+
+def test_late_fail_does_not_duplicate_the_job(make_queue):
+    queue = make_queue(max_attempts=3)
+    job_id = queue.enqueue(_request())
+    queue.reserve(0.05)
+    time.sleep(0.1)
+    queue.reserve(0.05)
+    time.sleep(0.1)
+
+    # The job's reservation expired, so a late failure report must not requeue it twice
+    queue.fail(job_id, "late")
+    assert queue.reserve(60)[0] == job_id
+    assert queue.reserve(60) is None
+
+
+def test_enqueue_applies_backpressure(make_queue):
+    queue = make_queue(max_pending=2)
+    first = queue.enqueue(_request())
+    queue.enqueue(_request())
+
+    with pytest.raises(QueueFullError):
+        queue.enqueue(_request())
+
+    # Running jobs still count; finished ones free a slot
+    queue.reserve(60)
+    with pytest.raises(QueueFullError):
+        queue.enqueue(_request())
+    queue.complete(first, {"success": True})
+    queue.enqueue(_request())
+
+
+def test_events_are_read_incrementally(make_queue):
+    queue = make_queue()
+    job_id = queue.enqueue(_request())
+
+    queue.publish_event(job_id, {"step": 1})
+    queue.publish_event(job_id, {"step": 2})
+    assert queue.get_events(job_id) == [{"step": 1}, {"step": 2}]
+    assert queue.get_events(job_id, after=1) == [{"step": 2}]
+    assert queue.get_events(job_id, after=2) == []
+
+
+def test_redis_reserve_moves_the_job_in_one_step(make_redis_queue):
+    queue = make_redis_queue()
+    job_id = queue.enqueue(_request())
+
+    before = time.time()
+    queue.reserve(60)
+    # Never in both or neither of the pending list and the reserved set
+    assert queue.client.llen(queue._pending_key) == 0
+    assert queue.client.zscore(queue._reserved_key, job_id) >= before + 60
+
+    queue.complete(job_id, {"success": True})
+    assert queue.client.zcard(queue._reserved_key) == 0
+
+
+def test_unknown_job_is_none(make_queue):
+    assert make_queue().get_job("missing") is None
+
+
+def test_incomplete_backend_cannot_be_created():
+    class EnqueueOnly(JobQueue):
+        def enqueue(self, request):
+            return "job"
+
+    with pytest.raises(TypeError):
+        EnqueueOnly()
+
+
+@pytest.mark.parametrize("reserve_first", [False, True])
+def test_cancel_withdraws_queued_and_running_jobs(make_queue, reserve_first):
+    queue = make_queue(max_pending=1)
+    job_id = queue.enqueue(_request())
+    if reserve_first:
+        queue.reserve(0.05)
+
+    queue.cancel(job_id, "Cancelled by test")
+    job = queue.get_job(job_id)
+    assert (job["status"], job["error"]) == (FAILED, "Cancelled by test")
+
+    # Its slot is free and it is never delivered again, even after the visibility timeout
+    time.sleep(0.1)
+    other = queue.enqueue(_request())
+    assert queue.reserve(60)[0] == other
+    assert queue.reserve(60) is None
+
+
+def test_cancel_leaves_finished_jobs_alone(make_queue):
+    queue = make_queue()
+    job_id = queue.enqueue(_request())
+    queue.reserve(60)
+    queue.complete(job_id, {"success": True})
+
+    queue.cancel(job_id)
+    assert queue.get_job(job_id)["status"] == COMPLETED
+
+
+def test_finished_jobs_expire_after_the_retention_period(make_queue):
+    queue = make_queue(max_attempts=1, retention=0.2)
+    completed = queue.enqueue(_request())
+    failed = queue.enqueue(_request())
+    running = queue.enqueue(_request())
+
+    queue.reserve(60)
+    queue.publish_event(completed, {"step": 1})
+    queue.complete(completed, {"success": True})
+    queue.reserve(60)
+    queue.fail(failed, "error")
+    queue.reserve(60)
+
+    time.sleep(0.3)
+    if isinstance(queue, SQLiteJobQueue):
+        assert queue.purge_finished() == 2
+
+    assert queue.get_job(completed) is None
+    assert queue.get_events(completed) == []
+    assert queue.get_job(failed) is None
+    # Jobs that are still running are kept however old they are
+    assert queue.get_job(running)["status"] == RUNNING
+
+
+def test_sqlite_enqueue_sweeps_finished_jobs(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, "JOB_PURGE_INTERVAL", 0)
+    queue = SQLiteJobQueue(path=str(tmp_path / "jobs.sqlite3"), retention=0.1)
+    job_id = queue.enqueue(_request())
+    queue.reserve(60)
+    queue.complete(job_id, {"success": True})
+
+    time.sleep(0.2)
+    queue.enqueue(_request())
+    assert queue.get_job(job_id) is None
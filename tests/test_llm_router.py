@@ -0,0 +1,164 @@
+"""Tests for per-role model routing: fallback, degraded-provider demotion and hedging."""
+
+import threading
+import time
+import pytest
+import llm_router
+from config import Config
+from llm_router import LatencyTracker, RoutedLLM
+
+
+class FakeProvider:
+    """Chat model stand-in that answers with its name after a delay, or fails."""
+
+    def __init__(self, name, delay=0.0, fail=False):
+        self.name = name
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def invoke(self, prompt):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError(f"{self.name} is down")
+        return self.name
+
+
+@pytest.fixture
+def providers(monkeypatch):
+    """Route every role to a primary then a secondary fake provider."""
+    fakes = {"primary": FakeProvider("primary"), "secondary": FakeProvider("secondary")}
+    monkeypatch.setattr(llm_router, "PROVIDERS", {
+        name: (lambda: True, lambda temperature, name=name: fakes[name]) for name in fakes
+    })
+    monkeypatch.setattr(llm_router, "_trackers", {name: LatencyTracker() for name in fakes})
+    monkeypatch.setattr(Config, "AGENT_MODEL_ROUTES", {"developer": ["primary", "secondary"]})
+    monkeypatch.setattr(Config, "HEDGE_REQUESTS", False)
+    return fakes
+
+
+def _timed_invoke(llm):
+    start = time.perf_counter()
+    response = llm.invoke("prompt")
+    return response, time.perf_counter() - start
+
+
+def test_latency_tracker_p95_needs_enough_samples(monkeypatch):
+    monkeypatch.setattr(Config, "HEDGE_MIN_SAMPLES", 5)
+    tracker = LatencyTracker(window=100)
+    for seconds in (0.1, 0.2, 0.3, 0.4):
+        tracker.record(seconds, success=True)
+    assert tracker.p95() is None
+
+    for i in range(96):
+        tracker.record(0.01 * (i + 5), success=True)
+    assert tracker.p95() == pytest.approx(0.96)
+
+
+def test_latency_tracker_degrades_on_recent_failures_and_recovers():
+    tracker = LatencyTracker()
+    tracker.record(1.0, success=False)
+    assert tracker.is_degraded()
+
+    for _ in range(3):
+        tracker.record(0.1, success=True)
+    assert not tracker.is_degraded()
+
+
+def test_latency_tracker_degrades_when_slow(monkeypatch):
+    monkeypatch.setattr(Config, "HEDGE_MIN_SAMPLES", 3)
+    monkeypatch.setattr(Config, "DEGRADED_LATENCY_SECONDS", 1.0)
+    tracker = LatencyTracker()
+    for _ in range(3):
+        tracker.record(2.0, success=True)
+    assert tracker.is_degraded()
+
+
+def test_unconfigured_providers_are_skipped(providers, monkeypatch):
+    monkeypatch.setitem(llm_router.PROVIDERS, "primary", (lambda: False, lambda temperature: providers["primary"]))
+    assert RoutedLLM("developer").providers == ["secondary"]
+
+
+def test_role_without_configured_providers_raises(providers, monkeypatch):
+    monkeypatch.setattr(Config, "AGENT_MODEL_ROUTES", {"developer": ["missing"]})
+    with pytest.raises(ValueError, match="developer"):
+        RoutedLLM("developer")
+
+
+def test_failing_primary_falls_back_to_the_next_provider(providers):
+    providers["primary"].fail = True
+    assert RoutedLLM("developer").invoke("prompt") == "secondary"
+    assert llm_router._trackers["primary"].is_degraded()
+
+
+def test_degraded_primary_is_tried_last(providers):
+    llm_router._trackers["primary"].record(1.0, success=False)
+    llm = RoutedLLM("developer")
+    assert llm._ordered_providers() == ["secondary", "primary"]
+    assert llm.invoke("prompt") == "secondary"
+    assert providers["primary"].calls == 0
+
+
+def test_all_providers_failing_raises_the_last_error(providers):
+    providers["primary"].fail = True
+    providers["secondary"].fail = True
+    with pytest.raises(RuntimeError, match="secondary is down"):
+        RoutedLLM("developer").invoke("prompt")
+
+
+@pytest.fixture
+def hedging(providers, monkeypatch):
+    monkeypatch.setattr(Config, "HEDGE_REQUESTS", True)
+    monkeypatch.setattr(Config, "HEDGE_DEFAULT_DELAY", 0.1)
+    return providers
+
+
+def test_fast_primary_is_not_hedged(hedging):
+    assert RoutedLLM("developer").invoke("prompt") == "primary"
+    assert hedging["secondary"].calls == 0
+
+
+def test_slow_primary_is_hedged_after_the_delay(hedging):
+    hedging["primary"].delay = 1.0
+    response, elapsed = _timed_invoke(RoutedLLM("developer"))
+    assert response == "secondary"
+    assert 0.1 <= elapsed < 0.5
+
+
+def test_hedge_delay_follows_the_primarys_p95(hedging, monkeypatch):
+    monkeypatch.setattr(Config, "HEDGE_MIN_SAMPLES", 3)
+    monkeypatch.setattr(Config, "HEDGE_DEFAULT_DELAY", 5.0)
+    for _ in range(3):
+        llm_router._trackers["primary"].record(0.05, success=True)
+
+    hedging["primary"].delay = 1.0
+    response, elapsed = _timed_invoke(RoutedLLM("developer"))
+    assert response == "secondary"
+    assert elapsed < 0.5
+
+
+def test_failing_primary_falls_back_without_waiting_for_the_delay(hedging, monkeypatch):
+    monkeypatch.setattr(Config, "HEDGE_DEFAULT_DELAY", 5.0)
+    hedging["primary"].fail = True
+    response, elapsed = _timed_invoke(RoutedLLM("developer"))
+    assert response == "secondary"
+    assert elapsed < 1.0
+
+
+def test_hedged_primary_still_wins_if_it_finishes_first(hedging):
+    hedging["primary"].delay = 0.15
+    hedging["secondary"].delay = 1.0
+    response, elapsed = _timed_invoke(RoutedLLM("developer"))
+    assert response == "primary"
+    assert hedging["secondary"].calls == 1
+    assert elapsed < 0.5
+
+
+def test_hedged_request_with_every_provider_failing_raises(hedging):
+    hedging["primary"].fail = True
+    hedging["secondary"].fail = True
+    with pytest.raises(RuntimeError, match="is down"):
+        RoutedLLM("developer").invoke("prompt")
@@ -0,0 +1,89 @@
+"""Tests for the empirical complexity fit and the performance thresholds."""
+
+import math
+import pytest
+from config import Config
+from profiling import analyze_performance, fit_complexity, predict_seconds, run_profile
+
+
+SIZES = [100, 300, 1000, 3000, 10000, 30000]
+
+
+def _measurements(growth, constant, noise=(1.0,), peak_bytes=1024):
+    """Synthetic timings following constant * growth(n), with a repeating relative noise pattern."""
+    return [
+        {"n": n, "seconds": constant * growth(n) * noise[i % len(noise)], "peak_bytes": peak_bytes}
+        for i, n in enumerate(SIZES)
+    ]
+
+
+@pytest.mark.parametrize("label, growth, constant", [
+    ("O(n)", lambda n: n, 1e-7),
+    ("O(n log n)", lambda n: n * math.log2(n), 1e-8),
+    ("O(n²)", lambda n: n ** 2, 1e-9),
+])
+@pytest.mark.parametrize("noise", [(1.0,), (1.05, 0.95, 1.02)])
+def test_fit_complexity_recovers_the_growth_rate(label, growth, constant, noise):
+    fitted_label, fitted_constant = fit_complexity(_measurements(growth, constant, noise))
+    assert fitted_label == label
+    assert fitted_constant == pytest.approx(constant, rel=0.1)
+
+
+def test_fit_complexity_needs_three_sizes():
+    assert fit_complexity(_measurements(lambda n: n, 1e-7)[:2]) is None
+
+
+def test_fit_complexity_prefers_the_slower_model_on_ties():
+    constant = [{"n": n, "seconds": 0.001, "peak_bytes": 0} for n in SIZES]
+    assert fit_complexity(constant)[0] == "O(1)"
+
+
+def test_predict_seconds_extrapolates_the_fitted_curve():
+    assert predict_seconds("O(n)", 1e-7, 100_000) == pytest.approx(0.01)
+    assert predict_seconds("O(n²)", 1e-9, 100_000) == pytest.approx(10.0)
+
+
+def test_linear_code_is_within_thresholds():
+    analysis = analyze_performance(_measurements(lambda n: n, 1e-7))
+    assert analysis["ok"]
+    assert analysis["report"].startswith("Performance within thresholds.")
+    assert "O(n)" in analysis["report"]
+
+
+def test_quadratic_code_fails_at_the_target_size():
+    analysis = analyze_performance(_measurements(lambda n: n ** 2, 1e-9))
+    assert not analysis["ok"]
+    assert analysis["report"].startswith("Performance issues: O(n²)")
+
+
+def test_single_slow_size_fails_without_a_fit():
+    measurements = [{"n": 100, "seconds": Config.PERFORMANCE_CALL_TIME_LIMIT * 2, "peak_bytes": 0}]
+    analysis = analyze_performance(measurements)
+    assert not analysis["ok"]
+    assert "not enough input sizes" in analysis["report"]
+    assert "already takes" in analysis["report"]
+
+
+def test_single_fast_size_passes_without_a_fit():
+    analysis = analyze_performance([{"n": 100, "seconds": 0.001, "peak_bytes": 0}])
+    assert analysis["ok"]
+
+
+def test_peak_memory_over_the_limit_fails(monkeypatch):
+    monkeypatch.setattr(Config, "PERFORMANCE_MAX_PEAK_MB", 1)
+    analysis = analyze_performance(_measurements(lambda n: n, 1e-7, peak_bytes=2 * 2 ** 20))
+    assert not analysis["ok"]
+    assert "peak memory of 2.0 MB exceeds 1 MB" in analysis["report"]
+
+
+def test_run_profile_times_the_harness_target():
+    code = "def total(values):\n    return sum(values)\n"
+    harness = "from solution import total\nTARGET = total\ndef make_input(n):\n    return (list(range(n)),)\n"
+    measurements = run_profile(code, harness, sizes=[10, 100], repeats=1)
+    assert [m["n"] for m in measurements] == [10, 100]
+    assert all(m["seconds"] >= 0 for m in measurements)
+
+
+def test_run_profile_reports_a_broken_harness():
+    with pytest.raises(RuntimeError, match="harness failed"):
+        run_profile("x = 1\n", "from solution import missing\n", sizes=[10], repeats=1)
@@ -0,0 +1,89 @@
+"""Tests for the project-manager skip classifier and its routing log."""
+
+import json
+import pytest
+import request_classifier
+from config import Config
+from request_classifier import (
+    classify_request,
+    extract_features,
+    log_routing_decision,
+    log_routing_outcome,
+    summarize_routing_log,
+)
+
+
+PRECISE_SPEC = """Write def merge_intervals(intervals: List[Tuple[int, int]]) -> List[Tuple[int, int]].
+Acceptance criteria:
+- returns the intervals merged and sorted by start
+- must raise ValueError when an interval has start > end
+- an empty list returns an empty list
+Example: merge_intervals([(1, 3), (2, 6)]) == [(1, 6)]
+"""
+
+
+@pytest.fixture(autouse=True)
+def routing_log(tmp_path, monkeypatch):
+    path = tmp_path / "routing.jsonl"
+    monkeypatch.setattr(Config, "ROUTING_LOG_PATH", str(path))
+    monkeypatch.setattr(Config, "REQUEST_CLASSIFIER_WEIGHTS_PATH", None)
+    return path
+
+
+def test_vague_one_liner_keeps_the_project_manager():
+    decision = classify_request("Make me a todo app")
+    assert decision["features"]["vague"] == 1.0
+    assert not decision["skip_project_manager"]
+    assert decision["score"] < Config.PM_SKIP_THRESHOLD
+
+
+def test_precise_spec_skips_the_project_manager():
+    decision = classify_request(PRECISE_SPEC)
+    features = decision["features"]
+    assert features["signature"] == 1.0
+    assert features["acceptance_criteria"] == 1.0
+    assert features["examples"] == 1.0
+    assert decision["skip_project_manager"]
+
+
+def test_features_are_bounded():
+    features = extract_features(PRECISE_SPEC * 10)
+    assert all(0.0 <= value <= 1.0 for value in features.values())
+
+
+def test_weights_file_overrides_the_defaults(tmp_path, monkeypatch):
+    weights_path = tmp_path / "weights.json"
+    weights_path.write_text(json.dumps({"bias": 10.0, "weights": {}}))
+    monkeypatch.setattr(Config, "REQUEST_CLASSIFIER_WEIGHTS_PATH", str(weights_path))
+    monkeypatch.setattr(request_classifier, "_weights_cache", {})
+
+    decision = classify_request("Make me a todo app")
+    assert decision["score"] > 0.99
+    assert decision["skip_project_manager"]
+
+
+def test_summary_compares_both_routes(routing_log):
+    log_routing_decision("skip-1", PRECISE_SPEC, classify_request(PRECISE_SPEC))
+    log_routing_outcome("skip-1", approved=True, iterations=1)
+    log_routing_decision("full-1", "Make me a todo app", classify_request("Make me a todo app"))
+    log_routing_outcome("full-1", approved=False, iterations=3)
+    log_routing_decision("full-2", "Build a chat bot", classify_request("Build a chat bot"))
+    log_routing_outcome("full-2", approved=True, iterations=1)
+    # Still running (or crashed): counted as a run but not as completed
+    log_routing_decision("full-3", "Write a game", classify_request("Write a game"))
+
+    summary = summarize_routing_log(str(routing_log))
+    assert summary["skipped_pm"] == {
+        "runs": 1, "completed": 1, "approved": 1, "approval_rate": 1.0, "avg_iterations": 1.0,
+    }
+    assert summary["full"] == {
+        "runs": 3, "completed": 2, "approved": 1, "approval_rate": 0.5, "avg_iterations": 2.0,
+    }
+
+
+def test_summary_of_a_route_without_outcomes(routing_log):
+    log_routing_decision("full-1", "Write a game", classify_request("Write a game"))
+    summary = summarize_routing_log(str(routing_log))
+    assert summary["full"]["completed"] == 0
+    assert summary["full"]["approval_rate"] is None
+    assert summary["skipped_pm"]["runs"] == 0
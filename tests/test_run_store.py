@@ -0,0 +1,99 @@
+"""Tests for the run store's embeddings, similarity search and exact-match cache."""
+
+import numpy as np
+import pytest
+from run_store import RunStore, embed_text
+
+
+LRU = "Implement an LRU cache class with get and put methods that run in O(1) time."
+LFU = "Implement an LFU cache class with get and put methods that run in O(1) time."
+
+
+@pytest.fixture
+def store(tmp_path):
+    return RunStore(str(tmp_path))
+
+
+def _add(store, request, code="pass", profiled=False):
+    return store.add(request=request, task=f"Task: {request}", final_code=code, tests="", iterations=0,
+                     profiled=profiled)
+
+
+def test_embed_text_is_normalized_and_deterministic():
+    vector = embed_text("Reverse a linked list")
+    assert vector.dtype == np.float32
+    assert np.linalg.norm(vector) == pytest.approx(1.0)
+    assert np.array_equal(vector, embed_text("Reverse a linked list"))
+    assert embed_text("abc", dim=64).shape == (64,)
+
+
+def test_embed_text_ignores_case_and_spacing():
+    assert np.allclose(embed_text("Reverse a  linked\nlist"), embed_text("reverse a linked list"))
+
+
+def test_embed_text_of_empty_text_is_zero():
+    assert not embed_text("").any()
+
+
+def test_search_orders_by_similarity_and_applies_threshold(store):
+    _add(store, "Reverse a singly linked list in place")
+    _add(store, "Parse an ISO 8601 date string into a datetime")
+
+    matches = store.search("Reverse a linked list", k=2)
+    assert [record["request"] for _, record in matches][0] == "Reverse a singly linked list in place"
+    assert matches[0][0] > matches[1][0]
+
+    assert store.search("Reverse a linked list", k=2, min_similarity=matches[0][0] - 1e-6) == matches[:1]
+    assert len(store.search("Reverse a linked list", k=1)) == 1
+
+
+def test_search_on_an_empty_store(store):
+    assert store.search("anything") == []
+
+
+def test_near_identical_requests_are_similar_but_not_exact(store):
+    _add(store, LRU, code="class LRUCache: ...")
+
+    # Similar enough to seed, but must never be reused directly
+    similarity, _ = store.search(LFU, k=1)[0]
+    assert similarity > 0.9
+    assert store.find_exact(LFU) is None
+    assert store.find_exact(LRU)["final_code"] == "class LRUCache: ..."
+
+
+def test_find_exact_normalizes_and_returns_the_latest_run(store):
+    _add(store, LRU, code="first")
+    _add(store, LRU, code="second")
+    assert store.find_exact("  implement an lru cache class with get and put methods\nthat run in O(1) time. ")["final_code"] == "second"
+
+
+def test_find_exact_profiled_only(store):
+    _add(store, LRU, code="profiled", profiled=True)
+    _add(store, LRU, code="unprofiled")
+
+    assert store.find_exact(LRU)["final_code"] == "unprofiled"
+    assert store.find_exact(LRU, profiled_only=True)["final_code"] == "profiled"
+    assert store.find_exact(LFU, profiled_only=True) is None
+
+
+def test_runs_added_by_another_process_are_seen(tmp_path):
+    ui, worker = RunStore(str(tmp_path)), RunStore(str(tmp_path))
+    assert len(ui) == 0
+
+    _add(worker, LRU)
+    assert len(ui) == 1
+    assert ui.find_exact(LRU) is not None
+    assert ui.search(LRU, k=1)[0][0] == pytest.approx(1.0)
+
+    # Both appending keeps both views complete
+    _add(ui, LFU)
+    assert len(worker) == 2
+    assert worker.find_exact(LFU) is not None
+
+
+def test_store_persists_and_rebuilds_a_damaged_index(tmp_path):
+    _add(RunStore(str(tmp_path)), LRU)
+    (tmp_path / "embeddings.npy").write_bytes(b"not a numpy file")
+
+    reopened = RunStore(str(tmp_path))
+    assert reopened.search(LRU, k=1)[0][0] == pytest.approx(1.0)
@@ -0,0 +1,179 @@
+"""Tests for single-flight coalescing of identical concurrent runs."""
+
+import threading
+import time
+import pytest
+from singleflight import SingleFlight
+
+
+class Cancelled(BaseException):
+    """Stands in for a Streamlit stop or KeyboardInterrupt."""
+
+
+def _start_followers(flight, key, fn, count):
+    """Start follower threads once the leader is running; return them with their outcomes."""
+    outcomes = {}
+
+    def follow(n):
+        events = []
+        try:
+            outcomes[n] = (flight.run(key, fn, events.append), events)
+        except Exception as e:
+            outcomes[n] = (e, events)
+
+    threads = [threading.Thread(target=follow, args=(n,)) for n in range(count)]
+    for thread in threads:
+        thread.start()
+    # Give the followers time to attach to the running flight
+    time.sleep(0.1)
+    return threads, outcomes
+
+
+def _run_leader(flight, key, fn):
+    """Run fn as leader in a thread; return the thread and its outcome holder."""
+    outcome = {}
+
+    def lead():
+        events = []
+        try:
+            outcome["value"] = (flight.run(key, fn, events.append), events)
+        except BaseException as e:
+            outcome["value"] = (e, events)
+
+    thread = threading.Thread(target=lead)
+    thread.start()
+    deadline = time.monotonic() + 5
+    while not flight.in_flight(key):
+        assert time.monotonic() < deadline, "leader never started"
+        time.sleep(0.01)
+    return thread, outcome
+
+
+def test_followers_share_the_leaders_result_and_events():
+    flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def work(emit):
+        calls.append(1)
+        emit({"step": 1})
+        release.wait(5)
+        emit({"step": 2})
+        return {"code": "ok"}
+
+    leader, leader_outcome = _run_leader(flight, "key", work)
+    followers, outcomes = _start_followers(flight, "key", work, 3)
+    release.set()
+    leader.join(5)
+    for thread in followers:
+        thread.join(5)
+
+    assert len(calls) == 1
+    assert leader_outcome["value"] == (({"code": "ok"}, False), [{"step": 1}, {"step": 2}])
+    assert len(outcomes) == 3
+    for result, events in outcomes.values():
+        assert result == ({"code": "ok"}, True)
+        assert events == [{"step": 1}, {"step": 2}]
+    assert not flight.in_flight("key")
+
+
+def test_leader_failure_is_raised_to_followers_and_not_cached():
+    flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def work(emit):
+        calls.append(1)
+        release.wait(5)
+        raise ValueError("boom")
+
+    leader, leader_outcome = _run_leader(flight, "key", work)
+    followers, outcomes = _start_followers(flight, "key", work, 2)
+    release.set()
+    leader.join(5)
+    for thread in followers:
+        thread.join(5)
+
+    assert len(calls) == 1
+    assert isinstance(leader_outcome["value"][0], ValueError)
+    for error, _ in outcomes.values():
+        assert isinstance(error, ValueError) and str(error) == "boom"
+
+    # The failed flight is gone, so the next call runs the work again
+    assert not flight.in_flight("key")
+    assert flight.run("key", lambda emit: "retried") == ("retried", False)
+
+
+def test_cancelled_leader_promotes_a_follower():
+    flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def work(emit):
+        calls.append(1)
+        emit({"attempt": len(calls)})
+        if len(calls) == 1:
+            release.wait(5)
+            raise Cancelled()
+        return "finished"
+
+    leader, leader_outcome = _run_leader(flight, "key", work)
+    followers, outcomes = _start_followers(flight, "key", work, 1)
+    release.set()
+    leader.join(5)
+    followers[0].join(5)
+
+    assert isinstance(leader_outcome["value"][0], Cancelled)
+    result, events = outcomes[0]
+    # The follower re-ran the work itself, so its result is not shared
+    assert result == ("finished", False)
+    assert len(calls) == 2
+    assert events[-1] == {"attempt": 2}
+    assert not flight.in_flight("key")
+
+
+def test_distinct_keys_run_independently():
+    flight = SingleFlight()
+    assert flight.run("a", lambda emit: 1) == (1, False)
+    assert flight.run("b", lambda emit: 2) == (2, False)
+
+
+@pytest.mark.parametrize("error", [RuntimeError("x"), Cancelled()])
+def test_flight_is_unregistered_after_an_error(error):
+    flight = SingleFlight()
+
+    def work(emit):
+        raise error
+
+    with pytest.raises(type(error)):
+        flight.run("key", work)
+    assert not flight.in_flight("key")
+
+
+def test_waiting_follower_can_detach_between_events():
+    flight = SingleFlight(wait_interval=0.02)
+    release = threading.Event()
+
+    def work(emit):
+        release.wait(5)
+        return "done"
+
+    leader, leader_outcome = _run_leader(flight, "key", work)
+    waits = []
+
+    def on_wait():
+        waits.append(1)
+        if len(waits) == 3:
+            raise Cancelled()
+
+    start = time.monotonic()
+    with pytest.raises(Cancelled):
+        flight.run("key", work, on_wait=on_wait)
+    # Detached long before the leader produced anything
+    assert time.monotonic() - start < 1
+
+    # The leader is unaffected by the follower leaving
+    assert flight.in_flight("key")
+    release.set()
+    leader.join(5)
+    assert leader_outcome["value"][0] == ("done", False)
@@ -0,0 +1,40 @@
+"""Tests for the pytest summary parser and the approval helpers."""
+
+import pytest
+from utils import execute_python_code, is_code_approved, normalize_request, parse_pytest_summary
+
+
+@pytest.mark.parametrize("output, expected", [
+    ("All tests passed!\nOutput:\n===== 3 passed in 0.01s =====", (3, 0)),
+    ("Tests failed.\nStdout:\n===== 1 failed, 2 passed in 0.02s =====", (2, 1)),
+    ("Tests failed.\nStdout:\n===== 1 failed, 2 passed, 1 error in 0.02s =====", (2, 2)),
+    ("Tests failed.\nStdout:\n===== 2 errors in 0.02s =====", (0, 2)),
+    ("All tests passed!\nOutput:\n===== 4 passed, 1 warning in 0.01s =====", (4, 0)),
+    ("Execution timed out.", (0, 0)),
+    ("An error occurred: [Errno 2] No such file or directory: 'pytest'", (0, 0)),
+])
+def test_parse_pytest_summary(output, expected):
+    assert parse_pytest_summary(output) == expected
+
+
+def test_normalize_request_folds_case_and_whitespace():
+    assert normalize_request("  Add\tTWO   numbers\n") == "add two numbers"
+
+
+@pytest.mark.parametrize("review, tests, performance_ok, approved", [
+    ("No issues found.", "All tests passed!", True, True),
+    ("No issues found.", "All tests passed!", False, False),
+    ("Missing docstring.", "All tests passed!", True, False),
+    ("No issues found.", "Tests failed.\n1 failed", True, False),
+    ("No issues found.", "An error occurred: boom", True, False),
+])
+def test_is_code_approved(review, tests, performance_ok, approved):
+    assert is_code_approved(review, tests, performance_ok) == approved
+
+
+def test_execute_python_code_with_embedded_code():
+    code = "def add(a, b):\n    return a + b\n"
+    tests = "def test_add():\n    assert add(1, 2) == 3\n\ndef test_add_fails():\n    assert add(1, 1) == 3\n"
+    result = execute_python_code("", f"{code}\n\n{tests}")
+    assert result.startswith("Tests failed.")
+    assert parse_pytest_summary(result) == (1, 1)
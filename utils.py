@@ -5,6 +5,7 @@ This module contains helper functions for code execution, file handling, and oth
 """
 
 import os
+import re
 import subprocess
 import tempfile
 from typing import Tuple
@@ -17,7 +18,7 @@ def execute_python_code(code: str, test_code: str) -> str:
     Executes Python code with corresponding tests in a temporary file and returns the result.
     
     Args:
-        code (str): The Python code to execute
+        code (str): The Python code to execute; may be empty when test_code already contains it
         test_code (str): The test code to run against the main code
         
     Returns:
@@ -28,9 +29,10 @@ def execute_python_code(code: str, test_code: str) -> str:
     
     try:
         # Create temporary files for code and tests
-        with tempfile.NamedTemporaryFile(mode="w+", delete=False, suffix=".py") as code_file:
-            code_file.write(code)
-            code_file_path = code_file.name
+        if code:
+            with tempfile.NamedTemporaryFile(mode="w+", delete=False, suffix=".py") as code_file:
+                code_file.write(code)
+                code_file_path = code_file.name
 
         with tempfile.NamedTemporaryFile(mode="w+", delete=False, suffix="_test.py") as test_file:
             test_file.write(test_code)
@@ -61,6 +63,34 @@ def execute_python_code(code: str, test_code: str) -> str:
             os.remove(test_file_path)
 
 
+def parse_pytest_summary(execution_result: str) -> Tuple[int, int]:
+    """
+    Extracts the passed and failed test counts from pytest output.
+    
+    Args:
+        execution_result (str): The result string returned by execute_python_code
+        
+    Returns:
+        Tuple[int, int]: (passed, failed) where errors are counted as failures
+    """
+    passed = sum(int(n) for n in re.findall(r"(\d+) passed", execution_result))
+    failed = sum(int(n) for n in re.findall(r"(\d+) (?:failed|errors?)\b", execution_result))
+    return passed, failed
+
+
+def normalize_request(user_request: str) -> str:
+    """
+    Normalizes a user request so trivially different submissions are treated as the same request.
+    
+    Args:
+        user_request (str): The user's feature request
+        
+    Returns:
+        str: Request with collapsed whitespace and case folded
+    """
+    return " ".join(user_request.split()).casefold()
+
+
 def clean_code_response(response_content: str) -> str:
     """
     Cleans up code response by removing markdown formatting.
@@ -74,7 +104,26 @@ def clean_code_response(response_content: str) -> str:
     return response_content.strip().replace("```python", "").replace("```", "").strip()
 
 
-def should_continue_development(review: str, test_results: str, iterations: int, max_iterations: int) -> Tuple[bool, str]:
+def is_code_approved(review: str, test_results: str, performance_ok: bool = True) -> bool:
+    """
+    Checks whether the reviewer found no issues, all tests passed and performance is acceptable.
+    
+    Args:
+        review (str): Code review feedback
+        test_results (str): Test execution results
+        performance_ok (bool): Whether the performance stage passed (True when it did not run)
+        
+    Returns:
+        bool: True if the code is approved
+    """
+    review_lower = review.lower()
+    test_results_lower = test_results.lower()
+    
+    return performance_ok and "no issues found" in review_lower and "tests failed" not in test_results_lower and "error" not in test_results_lower
+
+
+def should_continue_development(review: str, test_results: str, iterations: int, max_iterations: int,
+                                performance_ok: bool = True) -> Tuple[bool, str]:
     """
     Determines whether the development process should continue or end.
     
@@ -83,6 +132,7 @@ def should_continue_development(review: str, test_results: str, iterations: int,
         test_results (str): Test execution results
         iterations (int): Current iteration count
         max_iterations (int): Maximum allowed iterations
+        performance_ok (bool): Whether the performance stage passed (True when it did not run)
         
     Returns:
         Tuple[bool, str]: (should_continue, reason)
@@ -90,10 +140,7 @@ def should_continue_development(review: str, test_results: str, iterations: int,
     if iterations >= max_iterations:
         return False, "Max iterations reached"
     
-    review_lower = review.lower()
-    test_results_lower = test_results.lower()
-    
-    if "no issues found" in review_lower and "tests failed" not in test_results_lower and "error" not in test_results_lower:
+    if is_code_approved(review, test_results, performance_ok):
         return False, "Code approved - no issues found and all tests passed"
     else:
         return True, "Code requires refactoring based on review or test feedback"
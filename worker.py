@@ -0,0 +1,149 @@
+"""
+DevGenius AI Multi-Agent System - Job Worker
+
+Standalone process that pulls TaskRequests from the job queue, runs them with
+WorkflowManager and publishes progress events and results back for the UI.
+Start as many workers as needed, on one machine or many:
+
+    DEVGENIUS_JOB_QUEUE_BACKEND=redis python worker.py --concurrency 4
+"""
+
+import argparse
+import signal
+import threading
+import traceback
+from job_queue import JobQueue, get_job_queue
+from config import Config, validate_config
+
+
+def _heartbeat(queue: JobQueue, job_id: str, visibility_timeout: float, stop: threading.Event) -> None:
+    """
+    Keep a job reserved while it is running.
+
+    Args:
+        queue (JobQueue): The job queue
+        job_id (str): The running job
+        visibility_timeout (float): Visibility timeout in seconds
+        stop (threading.Event): Set when the job finishes
+    """
+    # Renew well before the deadline so a slow queue round-trip cannot expire it
+    while not stop.wait(visibility_timeout / 3):
+        try:
+            queue.heartbeat(job_id, visibility_timeout)
+        except Exception as e:
+            print(f"[worker] Heartbeat failed for job {job_id}: {e}")
+
+
+def run_job(queue: JobQueue, job_id: str, request, visibility_timeout: float) -> None:
+    """
+    Run a single reserved job and report its outcome to the queue.
+
+    Args:
+        queue (JobQueue): The job queue
+        job_id (str): The reserved job id
+        request (TaskRequest): The request to run
+        visibility_timeout (float): Visibility timeout in seconds
+    """
+    # Imported on first use, like the UI does, so idle workers start quickly
+    from workflow import WorkflowManager
+
+    stop = threading.Event()
+    heartbeat = threading.Thread(
+        target=_heartbeat,
+        args=(queue, job_id, visibility_timeout, stop),
+        daemon=True
+    )
+    heartbeat.start()
+
+    try:
+        # Tag events with the attempt so the UI can drop those of earlier, failed attempts
+        attempt = queue.get_job(job_id)["attempts"]
+        workflow_manager = WorkflowManager(
+            max_iterations=request.max_iterations,
+            num_candidates=request.num_candidates,
+            profile_performance=request.profile_performance
+        )
+        results = workflow_manager.execute_workflow(
+            request.description,
+            on_step=lambda event: queue.publish_event(job_id, {**event, "attempt": attempt})
+        )
+        queue.complete(job_id, results)
+        print(f"[worker] Job {job_id} completed (success={results['success']})")
+    except Exception as e:
+        traceback.print_exc()
+        queue.fail(job_id, f"{type(e).__name__}: {e}")
+        print(f"[worker] Job {job_id} failed: {e}")
+    finally:
+        stop.set()
+
+
+def worker_loop(queue: JobQueue, shutdown: threading.Event, poll_interval: float, visibility_timeout: float) -> None:
+    """
+    Reserve and run jobs until shutdown is requested.
+
+    Args:
+        queue (JobQueue): The job queue
+        shutdown (threading.Event): Set to stop after the current job
+        poll_interval (float): Seconds to sleep when the queue is empty
+        visibility_timeout (float): Visibility timeout in seconds
+    """
+    while not shutdown.is_set():
+        try:
+            reserved = queue.reserve(visibility_timeout)
+        except Exception as e:
+            print(f"[worker] Could not reserve a job: {e}")
+            reserved = None
+
+        if reserved is None:
+            shutdown.wait(poll_interval)
+            continue
+
+        job_id, request = reserved
+        print(f"[worker] Running job {job_id}")
+        run_job(queue, job_id, request, visibility_timeout)
+
+
+def main():
+    """Main worker function."""
+    parser = argparse.ArgumentParser(description="Run DevGenius workflow jobs from the job queue.")
+    parser.add_argument("--backend", choices=["sqlite", "redis"],
+                        help="Job queue backend. Defaults to DEVGENIUS_JOB_QUEUE_BACKEND or sqlite")
+    parser.add_argument("--concurrency", type=int, default=1, help="Jobs to run in parallel in this process")
+    parser.add_argument("--poll-interval", type=float, default=Config.JOB_POLL_INTERVAL,
+                        help="Seconds to wait when the queue is empty")
+    parser.add_argument("--visibility-timeout", type=float, default=Config.JOB_VISIBILITY_TIMEOUT,
+                        help="Seconds before a job without heartbeats is redelivered to another worker")
+    args = parser.parse_args()
+
+    validate_config()
+    queue = get_job_queue(args.backend or Config().JOB_QUEUE_BACKEND or "sqlite")
+
+    shutdown = threading.Event()
+
+    def request_shutdown(signum, frame):
+        print("[worker] Shutting down after the current jobs finish...")
+        shutdown.set()
+
+    signal.signal(signal.SIGINT, request_shutdown)
+    signal.signal(signal.SIGTERM, request_shutdown)
+
+    threads = [
+        threading.Thread(
+            target=worker_loop,
+            args=(queue, shutdown, args.poll_interval, args.visibility_timeout),
+            name=f"devgenius-worker-{i}"
+        )
+        for i in range(args.concurrency)
+    ]
+    for thread in threads:
+        thread.start()
+    print(f"[worker] Started {args.concurrency} worker thread(s) on the {type(queue).__name__}")
+
+    # Join with a timeout so the main thread keeps handling signals
+    while any(thread.is_alive() for thread in threads):
+        for thread in threads:
+            thread.join(timeout=1.0)
+
+
+if __name__ == "__main__":
+    main()
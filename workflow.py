@@ -4,18 +4,31 @@ Workflow management for DevGenius AI Multi-Agent System.
 This module contains the graph construction logic and workflow orchestration.
 """
 
+import uuid
+from typing import TYPE_CHECKING, Callable, Optional
 import streamlit as st
-from langgraph.graph import StateGraph, END
 from models import AgentState
 from agents import (
+    run_lookup_node,
     project_manager_node,
     developer_node,
     reviewer_node,
     tester_node,
+    performance_node,
     refactor_node
 )
-from utils import should_continue_development
+from utils import is_code_approved, normalize_request, should_continue_development
 from config import Config
+from singleflight import SingleFlight
+from request_classifier import classify_request, log_routing_decision, log_routing_outcome
+
+if TYPE_CHECKING:
+    # Imported lazily in create_workflow_graph() to keep application start-up fast
+    from langgraph.graph import StateGraph
+
+
+# Process-wide registry of in-flight runs, shared by every Streamlit session
+_inflight_runs = SingleFlight()
 
 
 def should_continue(state: AgentState) -> str:
@@ -32,7 +45,8 @@ def should_continue(state: AgentState) -> str:
         state.get("review", ""),
         state.get("test_results", ""),
         state['iterations'],
-        state['max_iterations']
+        state['max_iterations'],
+        state.get("performance_ok", True)
     )
     
     if not continue_dev:
@@ -46,30 +60,151 @@ def should_continue(state: AgentState) -> str:
         return "refactor"
 
 
-def create_workflow_graph() -> StateGraph:
+def route_after_tester(state: AgentState) -> str:
+    """
+    Decision point: runs the performance stage when enabled and the code passed
+    review and tests, otherwise decides as should_continue.
+    
+    Args:
+        state (AgentState): Current state of the workflow
+        
+    Returns:
+        str: "profile", "end" or "refactor"
+    """
+    # Profiling code that still has to be refactored would be wasted work
+    if state.get("profile_performance") and is_code_approved(state.get("review", ""), state.get("test_results", "")):
+        return "profile"
+    return should_continue(state)
+
+
+def route_request(state: AgentState) -> str:
+    """
+    Decision point after the run lookup: finishes on a cache hit and otherwise
+    sends precise specifications straight to the developer.
+    
+    Args:
+        state (AgentState): Current state of the workflow
+        
+    Returns:
+        str: "cached" to finish with the reused code, "developer" to skip the project manager or "project_manager"
+    """
+    if state.get("cache_hit"):
+        return "cached"
+    if not Config.ADAPTIVE_ROUTING_ENABLED:
+        return "project_manager"
+    
+    decision = classify_request(state['task'])
+    try:
+        log_routing_decision(state.get("run_id", ""), state['task'], decision)
+    except Exception as e:
+        st.warning(f"Could not log the routing decision: {e}")
+    
+    if decision["skip_project_manager"]:
+        st.info(f"Request is already a precise specification (score {decision['score']:.2f}); skipping the project manager.")
+        return "developer"
+    return "project_manager"
+
+
+def record_completed_run(user_request: str, state: dict) -> None:
+    """
+    Stores an approved run in the run store so later requests can reuse it.
+    
+    Args:
+        user_request (str): The original user request
+        state (dict): The accumulated final workflow state
+    """
+    if not Config.RUN_STORE_ENABLED or state.get("cache_hit"):
+        return
+    approved = is_code_approved(
+        state.get("review", ""),
+        state.get("test_results", ""),
+        state.get("performance_ok", True)
+    )
+    if not state.get("code") or not approved:
+        return
+    
+    from run_store import get_run_store
+    
+    try:
+        get_run_store().add(
+            request=user_request,
+            task=state.get("task", ""),
+            final_code=state["code"],
+            tests=state.get("test_code", ""),
+            iterations=state.get("iterations", 0),
+            profiled=bool(state.get("performance_measured"))
+        )
+    except Exception as e:
+        st.warning(f"Could not save this run to the run store: {e}")
+
+
+def record_routing_outcome(state: dict) -> None:
+    """
+    Logs whether a routed run was approved, to compare routes in the routing log.
+    
+    Args:
+        state (dict): The accumulated final workflow state
+    """
+    if not Config.ADAPTIVE_ROUTING_ENABLED or state.get("cache_hit"):
+        return
+    
+    approved = is_code_approved(
+        state.get("review", ""),
+        state.get("test_results", ""),
+        state.get("performance_ok", True)
+    )
+    try:
+        log_routing_outcome(state.get("run_id", ""), approved, state.get("iterations", 0))
+    except Exception as e:
+        st.warning(f"Could not log the routing outcome: {e}")
+
+
+def create_workflow_graph() -> "StateGraph":
     """
     Creates and configures the workflow graph for the multi-agent system.
     
     Returns:
         StateGraph: Compiled workflow graph
     """
+    from langgraph.graph import StateGraph, END
+    
     # Define the graph
     builder = StateGraph(AgentState)
 
     # Add nodes
+    builder.add_node("run_lookup", run_lookup_node)
     builder.add_node("project_manager", project_manager_node)
     builder.add_node("developer", developer_node)
     builder.add_node("reviewer", reviewer_node)
     builder.add_node("tester", tester_node)
+    builder.add_node("performance", performance_node)
     builder.add_node("refactor", refactor_node)
 
     # Define the edges
-    builder.set_entry_point("project_manager")
+    builder.set_entry_point("run_lookup")
+    builder.add_conditional_edges(
+        "run_lookup",
+        route_request,
+        {
+            "cached": END,
+            "project_manager": "project_manager",
+            "developer": "developer"
+        }
+    )
     builder.add_edge("project_manager", "developer")
     builder.add_edge("developer", "reviewer")
     builder.add_edge("reviewer", "tester")
     builder.add_conditional_edges(
         "tester",
+        route_after_tester,
+        {
+            "profile": "performance",
+            "refactor": "refactor",
+            "end": END
+        }
+    )
+    builder.add_conditional_edges(
+        "performance",
         should_continue,
         {
             "refactor": "refactor",
@@ -82,42 +217,28 @@ def create_workflow_graph() -> StateGraph:
     return builder.compile()
 
 
-def run_development_workflow(user_request: str, max_iterations: int = None) -> str:
+def run_development_workflow(user_request: str, max_iterations: int = None, num_candidates: int = None,
+                             profile_performance: bool = None) -> str:
     """
     Runs the complete development workflow for a given user request.
     
     Args:
         user_request (str): The user's feature request
         max_iterations (int, optional): Maximum number of iterations. Defaults to Config.MAX_ITERATIONS
+        num_candidates (int, optional): Speculative first drafts to generate. Defaults to Config.NUM_CANDIDATES
+        profile_performance (bool, optional): Run the performance stage. Defaults to Config.PROFILE_PERFORMANCE
         
     Returns:
         str: The final approved code
     """
-    if max_iterations is None:
-        max_iterations = Config.MAX_ITERATIONS
-    
-    # Create the workflow graph
-    graph = create_workflow_graph()
-    
-    # Run the graph
-    initial_state = {
-        "task": user_request,
-        "iterations": 0,
-        "max_iterations": max_iterations,
-        "messages": []
-    }
-
-    final_state = None
-    for s in graph.stream(initial_state):
-        # The final state is the last one streamed
-        final_state = s
-
-    # Extract the final code
-    if final_state:
-        final_code = final_state[next(reversed(final_state))].get('code')
-        return final_code
-    
-    return "No code generated"
+    # Same path as the UI, so runs are recorded and the result is built from the full state
+    workflow_manager = WorkflowManager(
+        max_iterations=max_iterations,
+        num_candidates=num_candidates,
+        profile_performance=profile_performance
+    )
+    results = workflow_manager.execute_workflow(user_request)
+    return results["final_code"] or "No code generated"
 
 
 class WorkflowManager:
@@ -125,50 +246,116 @@ class WorkflowManager:
     Manages the development workflow and provides additional utilities.
     """
     
-    def __init__(self, max_iterations: int = None):
+    def __init__(self, max_iterations: int = None, num_candidates: int = None, profile_performance: bool = None):
         """
         Initialize the workflow manager.
         
         Args:
             max_iterations (int, optional): Maximum iterations. Defaults to Config.MAX_ITERATIONS
+            num_candidates (int, optional): Speculative first drafts. Defaults to Config.NUM_CANDIDATES
+            profile_performance (bool, optional): Run the performance stage. Defaults to Config.PROFILE_PERFORMANCE
         """
         self.max_iterations = max_iterations or Config.MAX_ITERATIONS
+        self.num_candidates = num_candidates or Config.NUM_CANDIDATES
+        self.profile_performance = Config.PROFILE_PERFORMANCE if profile_performance is None else profile_performance
         self.graph = create_workflow_graph()
     
-    def execute_workflow(self, user_request: str) -> dict:
+    def coalescing_key(self, user_request: str) -> str:
+        """
+        Builds the key used to detect identical in-flight runs.
+        
+        Args:
+            user_request (str): The user's feature request
+            
+        Returns:
+            str: Key combining the normalized request and run settings
+        """
+        return f"{self.max_iterations}|{self.num_candidates}|{self.profile_performance}|{normalize_request(user_request)}"
+    
+    def execute_workflow(self, user_request: str, on_step: Optional[Callable[[dict], None]] = None,
+                         on_wait: Optional[Callable[[], None]] = None) -> dict:
         """
         Execute the development workflow and return detailed results.
         
+        Identical concurrent requests (same normalized text and settings) are
+        coalesced: only the first one runs the graph, the others follow its
+        progress events and share its result.
+        
+        Args:
+            user_request (str): The user's feature request
+            on_step (Callable, optional): Called with a progress event dict after each graph step
+            on_wait (Callable, optional): Called periodically while following an identical run;
+                a UI call here lets a stopped session detach
+            
+        Returns:
+            dict: Workflow execution results including final code and metadata
+        """
+        if not Config.COALESCE_IDENTICAL_RUNS:
+            results = self._run_graph(user_request, on_step or (lambda event: None))
+            results["coalesced"] = False
+            return results
+        
+        results, shared = _inflight_runs.run(
+            self.coalescing_key(user_request),
+            lambda emit: self._run_graph(user_request, emit),
+            on_event=on_step,
+            on_wait=on_wait
+        )
+        results = dict(results)
+        results["coalesced"] = shared
+        return results
+    
+    def _run_graph(self, user_request: str, emit: Callable[[dict], None]) -> dict:
+        """
+        Stream the graph for a request, emitting a progress event per step.
+        
         Args:
             user_request (str): The user's feature request
+            emit (Callable): Receives a progress event dict after each graph step
             
         Returns:
             dict: Workflow execution results including final code and metadata
         """
         initial_state = {
+            "run_id": uuid.uuid4().hex,
             "task": user_request,
             "iterations": 0,
             "max_iterations": self.max_iterations,
+            "num_candidates": self.num_candidates,
+            "profile_performance": self.profile_performance,
             "messages": []
         }
 
         final_state = None
         execution_steps = []
+        # Each streamed step only holds its node's update, so accumulate the full state
+        accumulated_state = dict(initial_state)
         
         for step_state in self.graph.stream(initial_state):
             execution_steps.append(step_state)
             final_state = step_state
+            node_name = next(reversed(step_state))
+            accumulated_state.update(step_state[node_name] or {})
+            emit({
+                "step": len(execution_steps),
+                "node": node_name,
+                "iterations": (step_state[node_name] or {}).get("iterations")
+            })
 
         # Extract results
         if final_state:
-            final_code = final_state[next(reversed(final_state))].get('code', "")
-            iterations_used = final_state[next(reversed(final_state))].get('iterations', 0)
+            final_code = accumulated_state.get('code', "")
+            iterations_used = accumulated_state.get('iterations', 0)
+            record_completed_run(user_request, accumulated_state)
+            record_routing_outcome(accumulated_state)
             
             return {
                 "final_code": final_code,
                 "iterations_used": iterations_used,
                 "max_iterations": self.max_iterations,
                 "execution_steps": len(execution_steps),
+                "cache_hit": bool(accumulated_state.get("cache_hit")),
+                "performance_report": accumulated_state.get("performance_report", ""),
                 "success": bool(final_code)
             }
         
@@ -177,5 +364,7 @@ class WorkflowManager:
             "iterations_used": 0,
             "max_iterations": self.max_iterations,
             "execution_steps": 0,
+            "cache_hit": False,
+            "performance_report": "",
             "success": False
         }